@@ -1,46 +1,137 @@
+from decorate import sortDecorated
+
 # To heapify a subtree rooted with node i
-def heapify(arr, n, i):
+# (low is the offset of the heap inside arr, so that
+# a sub-range arr[low..low+n-1] can be used as a heap)
+def heapify(arr, n, i, low=0):
+
+    # Hold the moving element in a local and only write
+    # it once, at the slot where it finally belongs
+    item = arr[low + i]
 
-    # Initialize largest as root
-    largest = i
+    while True:
 
-    # left index = 2*i + 1
-    l = 2 * i + 1
+        # left index = 2*i + 1
+        l = 2 * i + 1
+        if l >= n:
+            break
 
-    # right index = 2*i + 2
-    r = 2 * i + 2
+        # right index = 2*i + 2
+        r = l + 1
 
-    # If left child is larger than root
-    if l < n and arr[l] > arr[largest]:
+        # Pick the larger child
         largest = l
+        if r < n and arr[low + r] > arr[low + l]:
+            largest = r
+
+        # Stop once the item is not smaller than it
+        if not arr[low + largest] > item:
+            break
+
+        # Move the child up and continue from its slot
+        arr[low + i] = arr[low + largest]
+        i = largest
+
+    arr[low + i] = item
+
+# Sift-down in a d-ary heap (children of i are d*i+1 .. d*i+d)
+def siftDown(arr, n, i, low=0, d=2):
+    if d == 2:
+        heapify(arr, n, i, low)
+        return
+
+    item = arr[low + i]
+
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
 
-    # If right child is larger than largest so far
-    if r < n and arr[r] > arr[largest]:
-        largest = r
+        # Find the largest of up to d children
+        largest = first
+        for c in range(first + 1, min(first + d, n)):
+            if arr[low + c] > arr[low + largest]:
+                largest = c
 
-    # If largest is not root
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]
+        if not arr[low + largest] > item:
+            break
 
-        # Recursively heapify the affected sub-tree
-        heapify(arr, n, largest)
+        arr[low + i] = arr[low + largest]
+        i = largest
+
+    arr[low + i] = item
+
+# Floyd's bottom-up re-insertion of item into a heap of size n
+# whose root slot is empty: walk the hole down to a leaf along the
+# larger children without comparing against item, then sift item
+# up from there. Since item came from the bottom of the heap it
+# rarely climbs far, which roughly halves the comparisons.
+def floydSiftDown(arr, n, item, low=0, d=2):
+    i = 0
+
+    # Move the hole down to a leaf
+    if d == 2:
+        while True:
+            l = 2 * i + 1
+            if l >= n:
+                break
+            largest = l
+            if l + 1 < n and arr[low + l + 1] > arr[low + l]:
+                largest = l + 1
+            arr[low + i] = arr[low + largest]
+            i = largest
+    else:
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+
+            largest = first
+            for c in range(first + 1, min(first + d, n)):
+                if arr[low + c] > arr[low + largest]:
+                    largest = c
+
+            arr[low + i] = arr[low + largest]
+            i = largest
+
+    # Sift item back up from the leaf
+    while i > 0:
+        p = (i - 1) // d
+        if not item > arr[low + p]:
+            break
+        arr[low + i] = arr[low + p]
+        i = p
+
+    arr[low + i] = item
 
 # Main function to do heap sort
-def heapSort(arr):
-    n = len(arr)
+# (sorts arr[low..high], the whole array by default,
+# using a d-ary max-heap; d = 2 is the usual binary heap).
+# key= / reverse= work as in sorted(); with either of them, or with
+# stable=True, the range is sorted as (key, index) pairs, which
+# makes it stable (see decorate.py)
+def heapSort(arr, low=0, high=None, d=2, key=None, reverse=False, stable=False):
+    if high is None:
+        high = len(arr) - 1
+    if key is not None or reverse or stable:
+        sortDecorated(arr, low, high, lambda a, lo, hi: heapSort(a, lo, hi, d), key, reverse)
+        return
+    n = high - low + 1
+    if n < 2:
+        return
 
     # Build heap (rearrange vector)
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
+    for i in range((n - 2) // d, -1, -1):
+        siftDown(arr, n, i, low, d)
 
     # One by one extract an element from heap
     for i in range(n - 1, 0, -1):
 
-        # Move current root to end
-        arr[0], arr[i] = arr[i], arr[0]
-
-        # Call max heapify on the reduced heap
-        heapify(arr, i, 0)
+        # Move current root to end and re-insert
+        # the element it displaces
+        item = arr[low + i]
+        arr[low + i] = arr[low]
+        floydSiftDown(arr, i, item, low, d)
 
 if __name__ == "__main__":
     arr = [9, 4, 3, 8, 10, 2, 5]
@@ -1,3 +1,19 @@
+import math
+
+from decorate import sortDecorated
+from Heap_sort import heapSort
+from insertion_sort import insertionSort
+import tuning
+
+# ranges of at most this many elements are finished with (binary)
+# insertion sort in hybrid, introsort and 3-way modes
+# (calibrated per machine by tune_cutoffs.py, 16 by default)
+INSERTION_CUTOFF = tuning.get("quick_cutoff")
+
+# ranges longer than this pick the pivot with Tukey's
+# ninther (median of three medians-of-three)
+NINTHER_CUTOFF = 128
+
 # partition function
 def partition(arr, low, high):
     
@@ -25,8 +41,159 @@ def partition(arr, low, high):
 def swap(arr, i, j):
     arr[i], arr[j] = arr[j], arr[i]
 
+# return the index (a, b or c) holding the median
+# of arr[a], arr[b] and arr[c]
+def medianOfThree(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+# choose a pivot index for arr[low..high]: median-of-three
+# for small ranges, ninther for large ones
+def choosePivot(arr, low, high):
+    mid = low + (high - low) // 2
+    if high - low + 1 > NINTHER_CUTOFF:
+        s = (high - low + 1) // 8
+        a = medianOfThree(arr, low, low + s, low + 2 * s)
+        b = medianOfThree(arr, mid - s, mid, mid + s)
+        c = medianOfThree(arr, high - 2 * s, high - s, high)
+        return medianOfThree(arr, a, b, c)
+    return medianOfThree(arr, low, mid, high)
+
+# hybrid quicksort: median-of-three / ninther pivot, ranges of at
+# most cutoff elements (INSERTION_CUTOFF by default) are left to
+# insertion sort, and only the smaller side is recursed into while
+# the larger one is handled by the loop, so the depth is O(log n)
+def hybridQuickSort(arr, low, high, cutoff=None):
+    if cutoff is None:
+        cutoff = INSERTION_CUTOFF
+
+    while high - low + 1 > cutoff:
+        swap(arr, choosePivot(arr, low, high), high)
+        pi = partition(arr, low, high)
+        if pi - low < high - pi:
+            hybridQuickSort(arr, low, pi - 1, cutoff)
+            low = pi + 1
+        else:
+            hybridQuickSort(arr, pi + 1, high, cutoff)
+            high = pi - 1
+
+    insertionSort(arr, low, high, mode="binary")
+
+# introsort: quicksort with good pivots and an explicit stack,
+# falling back to heapsort when the partitions keep coming out
+# unbalanced, and to insertion sort for small ranges
+def introSort(arr, low, high):
+    if low >= high:
+        return
+
+    # allow about 2*log2(n) levels of partitioning
+    # before giving up on quicksort
+    depthLimit = 2 * int(math.log2(high - low + 1))
+
+    # pending ranges; only the larger side of a partition
+    # is pushed, so the stack holds O(log n) entries
+    stack = [(low, high, depthLimit)]
+
+    while stack:
+        low, high, depth = stack.pop()
+
+        while high - low + 1 > INSERTION_CUTOFF and depth > 0:
+            depth -= 1
+
+            # move the chosen pivot to the end so the usual
+            # partition() can be reused
+            swap(arr, choosePivot(arr, low, high), high)
+            pi = partition(arr, low, high)
+
+            # push the larger side, keep working on the smaller one
+            if pi - low < high - pi:
+                stack.append((pi + 1, high, depth))
+                high = pi - 1
+            else:
+                stack.append((low, pi - 1, depth))
+                low = pi + 1
+
+        if high - low + 1 > INSERTION_CUTOFF:
+            # too many bad splits: heapsort is O(n log n) on any input
+            heapSort(arr, low, high)
+        else:
+            insertionSort(arr, low, high, mode="binary")
+
+# three-way (Dutch national flag) partition of arr[low..high]
+# returns (lt, gt) such that arr[low..lt-1] < pivot,
+# arr[lt..gt] == pivot and arr[gt+1..high] > pivot
+# (the pivot is arr[p], or chosen with choosePivot if p is None)
+def partition3(arr, low, high, p=None):
+    if p is None:
+        p = choosePivot(arr, low, high)
+    pivot = arr[p]
+
+    lt = low
+    i = low
+    gt = high
+    while i <= gt:
+        if arr[i] < pivot:
+            swap(arr, lt, i)
+            lt += 1
+            i += 1
+        elif pivot < arr[i]:
+            swap(arr, i, gt)
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+# quicksort on three-way partitions: keys equal to the pivot
+# are left in the middle band and never looked at again, so
+# with k distinct keys there are at most k levels of partitioning
+def threeWayQuickSort(arr, low, high):
+    stack = [(low, high)]
+
+    while stack:
+        low, high = stack.pop()
+
+        while high - low + 1 > INSERTION_CUTOFF:
+            lt, gt = partition3(arr, low, high)
+
+            # push the larger side, keep working on the smaller one
+            if lt - low < high - gt:
+                stack.append((gt + 1, high))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1))
+                low = gt + 1
+
+        insertionSort(arr, low, high, mode="binary")
+
 # the QuickSort function implementation
-def quickSort(arr, low, high):
+# mode "classic" is the textbook last-element-pivot quicksort,
+# mode "hybrid" runs hybridQuickSort() (insertion sort below the cutoff),
+# mode "intro" runs introSort() on the same range and
+# mode "3way" runs threeWayQuickSort() for duplicate-heavy data.
+# key= / reverse= work as in sorted(); with either of them, or with
+# stable=True, the range is sorted as (key, index) pairs, which
+# makes every mode stable (see decorate.py)
+def quickSort(arr, low, high, mode="classic", key=None, reverse=False, stable=False):
+    if key is not None or reverse or stable:
+        sortDecorated(arr, low, high, lambda a, lo, hi: quickSort(a, lo, hi, mode), key, reverse)
+        return
+    if mode == "hybrid":
+        hybridQuickSort(arr, low, high)
+        return
+    if mode == "intro":
+        introSort(arr, low, high)
+        return
+    if mode == "3way":
+        threeWayQuickSort(arr, low, high)
+        return
+    if mode != "classic":
+        raise ValueError(f"unknown quicksort mode: {mode!r}")
+
     if low < high:
         
         # pi is the partition return index of pivot
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""McIlroy's adversary ("antiqsort") for comparison sorts.
+
+M. D. McIlroy, "A Killer Adversary for Quicksort", 1999. The sort is
+run on n placeholder elements whose values are decided lazily. At the
+start every element is "gas" (larger than anything decided). When two
+gas elements are compared, one of them is frozen to the next smallest
+value; McIlroy's rule freezes the current pivot candidate (the gas
+element seen most recently), so the pivot comes out low and the
+partition leaves almost everything on one side. Because the sort is
+deterministic, the frozen values form an input that makes it repeat
+exactly the same comparisons: for quicksort-like sorts, close to the
+most it can be forced to make. The rule attacks quicksort
+partitioning only: sorts that do not pick pivots (insertion, merge,
+Timsort) simply get sorted input, which is their best case.
+
+    python adversary.py --algo quicksort/intro --n 5000
+"""
+
+import argparse
+import math
+import sys
+
+
+class Adversary:
+    """Lazy values of n elements; cmp(i, j) < 0 when element i is smaller."""
+
+    def __init__(self, n):
+        self.gas = n
+        self.val = [n] * n
+        self.solid = 0
+        self.candidate = 0
+        self.comparisons = 0
+
+    def freeze(self, i):
+        self.val[i] = self.solid
+        self.solid += 1
+
+    def cmp(self, i, j):
+        self.comparisons += 1
+        val = self.val
+        gas = self.gas
+        if val[i] == gas and val[j] == gas:
+            if i == self.candidate:
+                self.freeze(i)
+            else:
+                self.freeze(j)
+        if val[i] == gas:
+            self.candidate = i
+        elif val[j] == gas:
+            self.candidate = j
+        return val[i] - val[j]
+
+    def values(self):
+        """The input: frozen values, then the remaining gas elements
+        in index order (they were never compared with each other)."""
+        out = list(self.val)
+        for i, v in enumerate(out):
+            if v == self.gas:
+                out[i] = self.solid
+                self.solid += 1
+        return out
+
+
+class Gas:
+    """Placeholder element whose comparisons ask the adversary."""
+
+    __slots__ = ("i", "adv")
+
+    def __init__(self, i, adv):
+        self.i = i
+        self.adv = adv
+
+    def __lt__(self, other):
+        return self.adv.cmp(self.i, other.i) < 0
+
+    def __le__(self, other):
+        return self.adv.cmp(self.i, other.i) <= 0
+
+    def __gt__(self, other):
+        return self.adv.cmp(self.i, other.i) > 0
+
+    def __ge__(self, other):
+        return self.adv.cmp(self.i, other.i) >= 0
+
+    def __eq__(self, other):
+        return self.adv.cmp(self.i, other.i) == 0
+
+    def __ne__(self, other):
+        return self.adv.cmp(self.i, other.i) != 0
+
+    __hash__ = None
+
+
+def antiqsort(sort, n):
+    """Adversarial input for sort(arr), an in-place comparison sort of
+    a list. Returns (input, comparisons made while building it); the
+    values are a permutation of 0..n-1."""
+    adv = Adversary(n)
+    sort([Gas(i, adv) for i in range(n)])
+    return adv.values(), adv.comparisons
+
+
+def adversary_case(sort):
+    """make(n) for benchmark.register_case: the antiqsort input of sort."""
+    def make(n):
+        # quadratic sorts recurse about n deep on their worst case; the
+        # limit is raised only while the input is built
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 2 * n + 1000))
+        try:
+            return antiqsort(sort, n)[0]
+        finally:
+            sys.setrecursionlimit(limit)
+    return make
+
+
+def main():
+    # benchmark registers adversary cases, so import it here
+    import benchmark
+
+    parser = argparse.ArgumentParser(description="Build McIlroy adversary inputs for a sort.")
+    parser.add_argument("--algo", required=True, help="registered python algorithm, e.g. quicksort/intro")
+    parser.add_argument("--n", type=int, nargs="+", default=[1_000, 2_000, 4_000])
+    parser.add_argument("--out", help="save the input for the largest n to this binary file")
+    args = parser.parse_args()
+
+    algo = benchmark.get_algorithm(args.algo)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * max(args.n) + 1000))
+
+    print(f"McIlroy adversary against {algo.name}:")
+    print("n\tcmps(adversary)\tcmps(random)\tadversary/(n log2 n)\tadversary/n^2")
+    print("-" * 80)
+    arr = None
+    for n in args.n:
+        arr, built = antiqsort(algo.run, n)
+        # replaying the input must take the same path
+        replay = benchmark.count_comparisons(algo, arr)
+        if replay != built:
+            print(f"warning: replay made {replay} comparisons, not {built} "
+                  "(is the sort deterministic?)")
+        rand = benchmark.count_comparisons(algo, benchmark.case_array("random", n))
+        print(f"{n}\t{replay}\t\t{rand}\t\t{replay / (n * math.log2(n)):.2f}\t\t\t{replay / n ** 2:.4f}")
+
+    if args.out:
+        from gen_quicksort_cases import save_array_bin
+        save_array_bin(args.out, arr, params={"adversary": algo.name, "n": len(arr)})
+        print(f"[Saved] {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import random
+import tempfile
+
+import benchmark
+from external_sort import externalSort
+import numpy_backend
+
+
+def write_random_text(path, size_bytes):
+    """Write random ints in [0, 10^9] one per line until the file
+    reaches about size_bytes; return the number written."""
+    n = 0
+    with open(path, "w", buffering=2 ** 20) as f:
+        written = 0
+        while written < size_bytes:
+            # ~10 bytes per line: do not overshoot small sizes
+            count = max(1_000, min(100_000, (size_bytes - written) // 10))
+            block = [random.randint(0, 10**9) for _ in range(count)]
+            text = "\n".join(map(str, block)) + "\n"
+            f.write(text)
+            written += len(text)
+            n += len(block)
+    return n
+
+
+def check_sorted_text(path):
+    """True if the integers in a text file are in ascending order."""
+    prev = None
+    with open(path) as f:
+        for line in f:
+            x = int(line)
+            if prev is not None and x < prev:
+                return False
+            prev = x
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of externalSort against file size.")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 4, 16, 64],
+                        help="input file sizes in MB")
+    parser.add_argument("--memory-mb", type=float, default=16,
+                        help="memory budget of the sort in MB")
+    parser.add_argument(
+        "--backend", choices=["python", "numpy", "both"], default="python",
+        help="sort chunks with the built-in list sort, the NumPy engine, or both",
+    )
+    parser.add_argument("--tmp-dir", help="directory for the input, output and run files")
+    parser.add_argument("--check", action="store_true", help="verify every output file")
+    benchmark.add_timing_args(parser, ops=False)
+    args = parser.parse_args()
+
+    prefix = "external_sort"
+    if args.backend != "python":
+        prefix += f"_{args.backend}"
+    memory = int(args.memory_mb * 2 ** 20)
+
+    rows = []
+    print(f"External sort throughput (memory={args.memory_mb} MB, median of {args.repeats}):")
+    print("MB\tn\t\tbackend\truns\tpasses\tT(s)\t\tMB/s")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory(prefix="extsort-bench-", dir=args.tmp_dir) as d:
+        for mb in args.sizes_mb:
+            src = os.path.join(d, "input.txt")
+            dst = os.path.join(d, "output.txt")
+            n = write_random_text(src, int(mb * 2 ** 20))
+            size = os.path.getsize(src)
+
+            for backend in benchmark.backend_list(args.backend):
+                useNumpy = backend == "numpy"
+                if useNumpy:
+                    numpy_backend.requireNumpy()
+                samples = []
+                for i in range(args.warmups + args.repeats):
+                    stats = externalSort(src, dst, memory, tmpDir=d, useNumpy=useNumpy)
+                    if i >= args.warmups:
+                        samples.append(stats["seconds"])
+                if args.check and not check_sorted_text(dst):
+                    raise SystemExit(f"output of {backend} for {mb} MB is not sorted")
+
+                row = {
+                    "algorithm": "external_sort",
+                    "backend": backend,
+                    "case": f"random/mem{args.memory_mb:g}MB",
+                    "n": n,
+                    "MB": size / 2 ** 20,
+                    "runs": stats["runs"],
+                    "passes": stats["passes"],
+                    "repeats": args.repeats,
+                    **benchmark.summarize(samples),
+                    "samples": samples,
+                }
+                row["MB_per_sec"] = row["MB"] / row["T_sec"]
+                rows.append(row)
+                print(f"{row['MB']:.1f}\t{n}\t\t{backend}\t{row['runs']}\t{row['passes']}\t"
+                      f"{row['T_sec']:.6f}\t{row['MB_per_sec']:.2f}")
+
+    benchmark.save_results(rows, args.store, args.tag)
+    benchmark.write_tables(prefix, rows, [
+        ("MB", "MB", "{:.1f}"),
+        ("n", "n", "{}"),
+        ("backend", "backend", "{}"),
+        ("runs", "runs", "{}"),
+        ("passes", "passes", "{}"),
+        *benchmark.TIME_COLUMNS,
+        ("MB_per_sec", "MB/s", "{:.2f}"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
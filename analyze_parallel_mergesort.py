@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+
+import benchmark
+from gen_quicksort_cases import make_random_case
+from parallel_merge_sort import parallelMergeSort
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for parallelMergeSort.")
+    parser.add_argument("--n", type=int, default=1_000_000,
+                        help="number of random integers to sort")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="benchmark 1..max-workers processes")
+    benchmark.add_timing_args(parser, ops=False)
+    args = parser.parse_args()
+
+    print(f"Generating {args.n} random integers ...")
+    arr = make_random_case(args.n)
+
+    rows = []
+
+    print(f"\nParallel merge sort scaling (median of {args.repeats}):")
+    print("workers\tT(s)\t\tIQR(s)\t\tspeedup\tefficiency")
+    print("-" * 64)
+
+    t1 = None
+    for p in range(1, args.max_workers + 1):
+        algo = benchmark.Algorithm(f"parallel_mergesort/p{p}", "python",
+                                   lambda a, p=p: parallelMergeSort(a, p))
+        samples, _ = benchmark.measure(algo, arr, args.repeats, args.warmups)
+        stats = benchmark.summarize(samples)
+        t = stats["T_sec"]
+        if t1 is None:
+            t1 = t
+        speedup = t1 / t
+        efficiency = speedup / p
+
+        print(f"{p}\t{t:.6f}\t{stats['T_iqr']:.6f}\t{speedup:.2f}\t{efficiency:.2f}")
+
+        rows.append({
+            "algorithm": algo.name,
+            "backend": algo.backend,
+            "case": "random",
+            "n": args.n,
+            "workers": p,
+            "repeats": args.repeats,
+            **stats,
+            "speedup": speedup,
+            "efficiency": efficiency,
+            "samples": samples,
+        })
+
+    benchmark.save_results(rows, args.store, args.tag)
+    benchmark.write_tables("parallel_mergesort", rows, [
+        ("n", "n", "{}"),
+        ("workers", "workers", "{}"),
+        *benchmark.TIME_COLUMNS,
+        ("speedup", "speedup", "{:.2f}"),
+        ("efficiency", "efficiency", "{:.2f}"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,81 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import time
-import math
+import argparse
 import sys
-import copy
-import csv
 
-from gen_quicksort_cases import load_array_txt, quickSort
-
-sys.setrecursionlimit(200000)
-
-
-def timed_quicksort(arr):
-    """Run quickSort on a *copy* of arr and return elapsed time in seconds."""
-    a = copy.copy(arr)
-    start = time.perf_counter()
-    quickSort(a, 0, len(a) - 1)
-    end = time.perf_counter()
-    return end - start
+import benchmark
+import complexity
 
 
 def main():
-    print("Loading arrays from txt files...")
-    arr_random_full = load_array_txt("arr_random_100000.txt")
-    arr_best_full   = load_array_txt("arr_quicksort_best_100000.txt")
-    arr_worst_full  = load_array_txt("arr_quicksort_worst_100000.txt")
-
-    sizes = [10_000, 20_000, 40_000, 80_000 , 100_000]
-
-    # collect all rows here
-    rows = []
-
-    print("n\tcase\tT(s)\t\tT/(n log2 n)\t\tT/n^2")
-    print("-" * 80)
-
-    for n in sizes:
-        A_rand  = arr_random_full[:n]
-        A_best  = arr_best_full[:n]
-        A_worst = arr_worst_full[:n]
-
-        for case_name, arr in [
-            ("random", A_rand),
-            ("best",   A_best),
-            ("worst",  A_worst),
-        ]:
-            t = timed_quicksort(arr)
-            t_over_nlogn = t / (n * math.log2(n))
-            t_over_n2    = t / (n ** 2)
-
-            print(f"{n}\t{case_name}\t{t:.6f}\t{t_over_nlogn:.3e}\t{t_over_n2:.3e}")
-
-            rows.append({
-                "n": n,
-                "case": case_name,
-                "T_sec": t,
-                "T_over_nlogn": t_over_nlogn,
-                "T_over_n2": t_over_n2,
-            })
-
-        print("-" * 80)
-
-    # ---------- save as CSV ----------
-    csv_filename = "quicksort_results.csv"
-    with open(csv_filename, "w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["n", "case", "T_sec", "T_over_nlogn", "T_over_n2"]
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"\n[Saved] {csv_filename}")
-
-    # ---------- save as Markdown ----------
-    md_filename = "quicksort_results.md"
-    with open(md_filename, "w") as f:
-        f.write("| n | case | T (s) | T/(n log₂ n) | T/n² |\n")
-        f.write("|---|------|--------|--------------|------|\n")
-        for r in rows:
-            f.write(
-                f"| {r['n']} | {r['case']} | "
-                f"{r['T_sec']:.6f} | {r['T_over_nlogn']:.3e} | {r['T_over_n2']:.3e} |\n"
-            )
-    print(f"[Saved] {md_filename}")
-
-    # ---------- optional: compare with built-in sort on full 100000 ----------
+    parser = argparse.ArgumentParser(description="Benchmark quickSort.")
+    parser.add_argument(
+        "--mode", choices=["classic", "hybrid", "intro", "3way"], default="classic",
+        help="classic: last-element pivot; hybrid: insertion sort below the "
+             "tuned cutoff; intro: introsort engine; 3way: three-way partitioning",
+    )
+    parser.add_argument(
+        "--backend", choices=["python", "numpy", "both"], default="python",
+        help="pure-Python lists, the vectorized NumPy engine, or both",
+    )
+    parser.add_argument(
+        "--adversary", action="store_true",
+        help="add McIlroy's adversarial input for the chosen mode (slow to build "
+             "for modes it drives to O(n^2); combine with --adaptive --max-n)",
+    )
+    benchmark.add_timing_args(parser)
+    complexity.add_sweep_args(parser)
+    args = parser.parse_args()
+
+    if args.mode == "classic":
+        # so that worst-case (sorted) input won't crash the recursion
+        sys.setrecursionlimit(200000)
+
+    # classic keeps the historical file names
+    prefix = "quicksort" if args.mode == "classic" else f"quicksort_{args.mode}"
+    if args.backend != "python":
+        prefix += f"_{args.backend}"
+
+    # the numpy engine has no modes: every --mode runs quicksort@numpy
+    algorithms = [benchmark.get_algorithm(f"quicksort/{args.mode}", b)
+                  for b in benchmark.backend_list(args.backend)]
+    # classic keeps the historical data files; the other modes get
+    # inputs built for their own pivot rule
+    best, worst = "quick_best", "quick_worst"
+    if args.mode != "classic":
+        best = f"quick_best/{args.mode}"
+        worst = f"quick_worst/{args.mode}"
+    cases = [
+        ("random", "random"),
+        ("best",   best),
+        ("worst",  worst),
+        # heavy duplicates: 100k values drawn from 0..999
+        ("dups",   "dups"),
+    ]
+    if args.adversary:
+        cases.append(("adversary", f"antiqsort/quicksort/{args.mode}"))
+    sizes = [10_000, 20_000, 40_000, 80_000, 100_000]
+
+    print(f"Quick sort timing (mode={args.mode}, median of {args.repeats}):")
+    run_args = dict(repeats=args.repeats, warmups=args.warmups, ops=args.ops)
+    if args.adaptive:
+        rows = complexity.adaptive_run(algorithms, cases, max_n=args.max_n, **run_args)
+    else:
+        rows = benchmark.run(algorithms, cases, sizes, **run_args)
+    benchmark.save_results(rows, args.store, args.tag)
+
+    benchmark.write_tables(prefix, rows, benchmark.BASE_COLUMNS + benchmark.TIME_COLUMNS
+                           + benchmark.ratio_columns(["nlogn", "n2"])
+                           + (benchmark.OP_COLUMNS if args.ops else []))
+    complexity.report(rows)
+
+    # ---------- compare with built-in sort on full 100000 ----------
     print("\nCompare with Python built-in sort on n = 100000:")
-    n = 100_000
-    for name, arr in [
-        ("random", arr_random_full),
-        ("best",   arr_best_full),
-        ("worst",  arr_worst_full),
-    ]:
-        b = copy.copy(arr)
-        start = time.perf_counter()
-        b.sort()
-        end = time.perf_counter()
-        print(f"builtin.sort, {name}, n={n}: {end - start:.6f} s")
+    builtin = [benchmark.get_algorithm("builtin")]
+    # the adversary input is specific to the quicksort mode
+    benchmark.run(builtin, [c for c in cases if c[0] != "adversary"], [100_000],
+                  args.repeats, args.warmups)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+
+import benchmark
+from Heap_sort import heapSort
+from Quick_sort import quickSort
+from selection import nthElement, partialSort, topK
+
+
+def selectors(k):
+    """(name, run) pairs that find the k smallest elements of a."""
+    return [
+        (f"nth_element/k{k}", lambda a: nthElement(a, k - 1)),
+        (f"partial_sort/k{k}", lambda a: partialSort(a, k)),
+        (f"top_k/k{k}", lambda a: topK(a, k, largest=False)),
+    ]
+
+
+# full sorts the selections are compared against
+FULL_SORTS = [
+    ("quicksort/intro", lambda a: quickSort(a, 0, len(a) - 1, mode="intro")),
+    ("heapsort/d2", lambda a: heapSort(a)),
+    ("builtin", lambda a: a.sort()),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Selection and partial sort against full sorting.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 100, 1000],
+                        help="number of smallest elements wanted")
+    parser.add_argument("--case", default="random", help="input case (see benchmark.py --list)")
+    benchmark.add_timing_args(parser, ops=False)
+    args = parser.parse_args()
+
+    rows = []
+    print(f"Selection vs full sort on {args.case} input (median of {args.repeats}):")
+    print("n\tk\talgorithm\t\tT(s)\t\tvs quicksort")
+    print("-" * 72)
+
+    for n in args.sizes:
+        arr = benchmark.case_array(args.case, n)
+        full = {}
+        runs = [(None, name, run) for name, run in FULL_SORTS]
+        runs += [(k, name, run) for k in args.k if k <= n for name, run in selectors(k)]
+
+        for k, name, run in runs:
+            algo = benchmark.Algorithm(name, "python", run)
+            samples, _ = benchmark.measure(algo, arr, args.repeats, args.warmups)
+            stats = benchmark.summarize(samples)
+            if k is None:
+                full[name] = stats["T_sec"]
+            speedup = full["quicksort/intro"] / stats["T_sec"]
+
+            print(f"{n}\t{k if k else '-'}\t{name:<20}\t{stats['T_sec']:.6f}\t{speedup:.2f}x")
+            rows.append({
+                "algorithm": name,
+                "backend": "python",
+                "case": args.case,
+                "n": n,
+                "k": k,
+                "repeats": args.repeats,
+                **stats,
+                "speedup": speedup,
+                "samples": samples,
+            })
+
+    benchmark.save_results(rows, args.store, args.tag)
+    benchmark.write_tables("selection", rows, [
+        ("n", "n", "{}"),
+        ("k", "k", "{}"),
+        ("algorithm", "algorithm", "{}"),
+        *benchmark.TIME_COLUMNS,
+        ("speedup", "vs quicksort", "{:.2f}x"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
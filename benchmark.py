@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Shared benchmark runner for the sorting algorithms in this project.
+
+Algorithms and input cases live in two registries. Adding one is a
+single register_algorithm() / register_case() call; every analyze_*.py
+script is a thin wrapper that picks entries from them.
+
+Each measurement runs warmups plus repeated samples on a fresh copy of
+the input, with the garbage collector disabled while the clock runs,
+and reports median, min and interquartile range. Every run is also
+appended to one JSON-lines results store (benchmark_results.jsonl),
+tagged with the Python version and a machine fingerprint, so that
+compare_results.py can check one run against an earlier baseline.
+"""
+
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from gen_quicksort_cases import (QUICK_MODES, load_array, make_best_case, make_best_case_array,
+                                 make_random_case, make_worst_case, save_array_txt)
+from Quick_sort import quickSort
+from merge_sort import mergeSort
+from Heap_sort import heapSort
+from insertion_sort import insertionSort
+from radix_sort import radixSort
+from instrument import FIELDS as OP_FIELDS, VERSION as OPS_VERSION, count_ops, instrumented
+from tuning import machine_fingerprint
+from adversary import adversary_case
+import sort_dispatch
+import numpy_backend
+import workloads
+
+STORE = "benchmark_results.jsonl"
+REPEATS = 5
+WARMUPS = 1
+# seed of the generated (workload) cases
+SEED = 0
+
+# (name, backend) -> Algorithm
+ALGORITHMS = {}
+# name -> function n -> list of at least n ints
+CASES = {}
+
+
+class Algorithm:
+    """A registered sort.
+
+    run(a) sorts a in place; it may return a dict of extra columns
+    (e.g. {"passes": 3}) which are recorded with the timing. traced(a),
+    if given, does the same through the operation-counting copy of
+    the code (see instrument.py); it is never timed.
+    """
+
+    __slots__ = ("name", "backend", "run", "traced")
+
+    def __init__(self, name, backend, run, traced=None):
+        self.name = name
+        self.backend = backend
+        self.run = run
+        self.traced = traced
+
+
+def register_algorithm(name, run, backend="python", traced=None):
+    """Register run(a) under (name, backend) and return it."""
+    ALGORITHMS[(name, backend)] = Algorithm(name, backend, run, traced)
+    return run
+
+
+def get_algorithm(name, backend="python"):
+    """The (name, backend) entry. Where a non-Python backend has a
+    single engine for a sort, it is registered under the bare sort name
+    and answers for every mode: quicksort/intro@numpy is quicksort@numpy,
+    and its rows are labelled as such."""
+    family = name.split("/")[0]
+    if backend != "python" and (name, backend) not in ALGORITHMS \
+            and (family, backend) in ALGORITHMS:
+        name = family
+    try:
+        return ALGORITHMS[(name, backend)]
+    except KeyError:
+        known = ", ".join(sorted(f"{a}@{b}" for a, b in ALGORITHMS))
+        raise ValueError(f"unknown algorithm: {name!r}@{backend} (known: {known})") from None
+
+
+def register_case(name, make, prefix=True):
+    """Register an input generator: make(n) returns at least n ints.
+
+    With prefix=False the case is built for every n separately instead
+    of being cut from a larger array (for inputs whose structure
+    depends on n, such as an organ pipe or a killer sequence).
+    """
+    CASES[name] = make
+    if not prefix:
+        EXACT_CASES.add(name)
+    return make
+
+
+# cases that are not cut from a larger array
+EXACT_CASES = set()
+
+# largest array built so far per case; smaller sizes are its prefixes,
+# like the [:n] slices the original scripts took
+_case_cache = {}
+
+
+def case_array(name, n):
+    if name not in CASES:
+        raise ValueError(f"unknown case: {name!r} (known: {', '.join(sorted(CASES))})")
+    key = (name, n) if name in EXACT_CASES else name
+    full = _case_cache.get(key)
+    if full is None or len(full) < n:
+        full = CASES[name](n)
+        _case_cache[key] = full
+    return full[:n]
+
+
+def workload_case(name, seed=SEED, **params):
+    """Case generated by workloads.generate() with a fixed seed."""
+    return lambda n: workloads.generate(name, n, seed, **params).tolist()
+
+
+def file_case(filename, make):
+    """Case backed by a data file: the file is read when it holds enough
+    elements, otherwise make(n) is used. A missing file is created for
+    next time; an existing one is never overwritten."""
+    def load(n):
+        exists = os.path.exists(filename)
+        if exists:
+            arr = load_array(filename)
+            if len(arr) >= n:
+                return arr
+        arr = make(n)
+        if not exists:
+            save_array_txt(filename, arr)
+        return arr
+    return load
+
+
+# ===========
+# Measurement
+# ===========
+
+class CountingKey:
+    """Wraps a value and counts every comparison made on it."""
+
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        CountingKey.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        CountingKey.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        CountingKey.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        CountingKey.comparisons += 1
+        return self.value >= other.value
+
+
+def count_comparisons(algo, arr):
+    """Run a pure-Python algorithm on wrapped copies of arr and return
+    its comparison count (a separate, untimed run)."""
+    a = [CountingKey(x) for x in arr]
+    CountingKey.comparisons = 0
+    algo.run(a)
+    return CountingKey.comparisons
+
+
+def summarize(samples):
+    """Median, min and interquartile range of a list of timings."""
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = q3 = samples[0]
+    return {
+        "T_sec": statistics.median(samples),
+        "T_min": min(samples),
+        "T_iqr": q3 - q1,
+    }
+
+
+def measure(algo, arr, repeats=REPEATS, warmups=WARMUPS):
+    """Time algo on fresh copies of arr.
+
+    Returns (samples, extra): the timings of the `repeats` runs after
+    `warmups` untimed ones, and the extra columns of the last run.
+    Copying happens outside the timed region, and GC is collected
+    before and disabled during each run.
+    """
+    prepare = numpy_backend.arrayCopy if algo.backend == "numpy" else list
+    samples = []
+    extra = None
+    gcWasEnabled = gc.isenabled()
+    try:
+        for i in range(warmups + repeats):
+            a = prepare(arr)
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            extra = algo.run(a)
+            end = time.perf_counter()
+            gc.enable()
+            if i >= warmups:
+                samples.append(end - start)
+    finally:
+        if gcWasEnabled:
+            gc.enable()
+        else:
+            gc.disable()
+    return samples, extra or {}
+
+
+# T divided by these growth functions gives the ratio columns
+GROWTH = {
+    "n": lambda n: n,
+    "nlogn": lambda n: n * math.log2(n),
+    "n2": lambda n: n ** 2,
+}
+
+
+def count_operations(algo, arr):
+    """Operation counts (op_cmps, op_moves, ...) of one untimed run of
+    the instrumented copy of algo, all None if it has none. op_version
+    is instrument.VERSION, the meaning of the counts."""
+    if algo.traced is None:
+        return {f"op_{f}": None for f in OP_FIELDS + ("version",)}
+    a = list(arr)
+    counts = count_ops(lambda: algo.traced(a))
+    return {**{f"op_{f}": v for f, v in counts.items()}, "op_version": OPS_VERSION}
+
+
+def run(algorithms, cases, sizes, repeats=REPEATS, warmups=WARMUPS,
+        count=False, ratios=("nlogn", "n2"), ops=False, log=print):
+    """Benchmark every (algorithm, case, n) combination.
+
+    algorithms: Algorithm objects, cases: (label, case name) pairs.
+    Returns one row dict per combination. With count=True the
+    comparison count of pure-Python algorithms is added as "cmps";
+    with ops=True the instrumented operation counts are added too.
+    """
+    rows = []
+    for n in sizes:
+        for label, case in cases:
+            arr = case_array(case, n)
+            for algo in algorithms:
+                samples, extra = measure(algo, arr, repeats, warmups)
+                row = {
+                    "algorithm": algo.name,
+                    "backend": algo.backend,
+                    "case": label,
+                    "n": n,
+                    "repeats": repeats,
+                    **summarize(samples),
+                    **extra,
+                    "samples": samples,
+                }
+                if count:
+                    row["cmps"] = count_comparisons(algo, arr) if algo.backend == "python" else None
+                if ops:
+                    row.update(count_operations(algo, arr))
+                for r in ratios:
+                    row[f"T_over_{r}"] = row["T_sec"] / GROWTH[r](n)
+                if log:
+                    log(f"{n}\t{label:<12}\t{algo.name}@{algo.backend}\t"
+                        f"{row['T_sec']:.6f}\t(min {row['T_min']:.6f}, IQR {row['T_iqr']:.6f})")
+                rows.append(row)
+    return rows
+
+
+# ============
+# Result store
+# ============
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "fingerprint": machine_fingerprint(),
+        "commit": git_commit(),
+    }
+
+
+# fields that identify "the same measurement" across runs
+HISTORY_KEY = ("algorithm", "backend", "case", "n", "python", "fingerprint")
+
+
+def history_key(record):
+    return tuple(record.get(k) for k in HISTORY_KEY)
+
+
+def save_results(rows, store=STORE, tag=None):
+    """Append rows to the JSON-lines store, one record per row, all
+    sharing one run id, timestamp, optional tag and environment."""
+    meta = {
+        "run_id": uuid.uuid4().hex[:12],
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tag": tag,
+        "argv": sys.argv,
+        **environment(),
+    }
+    with open(store, "a") as f:
+        for r in rows:
+            f.write(json.dumps({**meta, **r}) + "\n")
+    return store
+
+
+def load_results(store=STORE):
+    if not os.path.exists(store):
+        return []
+    with open(store) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_tables(prefix, rows, columns):
+    """Write rows to {prefix}_results.csv and {prefix}_results.md.
+
+    columns is a list of (key, header, format) triples; format is a
+    str.format spec such as "{:.6f}", and None values print as "-".
+    """
+    csv_filename = f"{prefix}_results.csv"
+    with open(csv_filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[k for k, _, _ in columns], extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    md_filename = f"{prefix}_results.md"
+    with open(md_filename, "w") as f:
+        f.write("| " + " | ".join(h for _, h, _ in columns) + " |\n")
+        f.write("|" + "|".join("-" * (len(h) + 2) for _, h, _ in columns) + "|\n")
+        for r in rows:
+            cells = ["-" if r.get(k) is None else fmt.format(r[k]) for k, _, fmt in columns]
+            f.write("| " + " | ".join(cells) + " |\n")
+
+    print(f"\n[Saved] {csv_filename}")
+    print(f"[Saved] {md_filename}")
+
+
+# columns every table starts with
+BASE_COLUMNS = [
+    ("n", "n", "{}"),
+    ("case", "case", "{}"),
+    ("backend", "backend", "{}"),
+]
+TIME_COLUMNS = [
+    ("T_sec", "T (s)", "{:.6f}"),
+    ("T_min", "min (s)", "{:.6f}"),
+    ("T_iqr", "IQR (s)", "{:.6f}"),
+]
+RATIO_HEADERS = {"n": "T/n", "nlogn": "T/(n log2 n)", "n2": "T/n^2"}
+# instrumented operation counts, added by run(..., ops=True)
+OP_COLUMNS = [
+    ("op_cmps", "compares", "{}"),
+    ("op_moves", "moves", "{}"),
+    ("op_swaps", "swaps", "{}"),
+    ("op_allocs", "allocs", "{}"),
+    ("op_alloc_elems", "alloc elems", "{}"),
+    ("op_depth", "depth", "{}"),
+    ("op_version", "ops v", "{}"),
+]
+
+
+def ratio_columns(ratios):
+    return [(f"T_over_{r}", RATIO_HEADERS[r], "{:.3e}") for r in ratios]
+
+
+def add_timing_args(parser, ops=True):
+    parser.add_argument("--repeats", type=int, default=REPEATS,
+                        help="timed runs per measurement (median is reported)")
+    parser.add_argument("--warmups", type=int, default=WARMUPS,
+                        help="untimed runs before the timed ones")
+    parser.add_argument("--store", default=STORE,
+                        help="JSON-lines file the results are appended to")
+    if ops:
+        parser.add_argument("--ops", action="store_true",
+                            help="also count comparisons, moves, swaps, allocations and "
+                                 "recursion depth with an instrumented (untimed) run")
+    parser.add_argument("--tag",
+                        help="label for this run, e.g. a baseline name for compare_results.py")
+
+
+def backend_list(backend):
+    return ["python", "numpy"] if backend == "both" else [backend]
+
+
+# ========================
+# Built-in registrations
+# ========================
+
+register_case("random", file_case("arr_random_100000.txt", make_random_case))
+register_case("ascending", lambda n: list(range(n)))
+register_case("descending", lambda n: list(range(n, 0, -1)))
+register_case("quick_best", file_case("arr_quicksort_best_100000.txt", make_best_case_array))
+register_case("quick_worst", file_case("arr_quicksort_worst_100000.txt", make_worst_case))
+# exact best / worst input for each quickSort mode, built for every n
+for _mode in QUICK_MODES:
+    register_case(f"quick_best/{_mode}", lambda n, m=_mode: make_best_case(n, m), prefix=False)
+    register_case(f"quick_worst/{_mode}", lambda n, m=_mode: make_worst_case(n, m), prefix=False)
+# few distinct values: ints in 0..999 (few digits for radix sort)
+register_case("dups", file_case("arr_radix_best_100000.txt",
+                                workload_case("uniform", low=0, high=999)))
+# many digits: ints in 0..10^9
+register_case("wide", file_case("arr_radix_worst_100000.txt",
+                                workload_case("uniform", low=0, high=10**9)))
+register_case("zipf", workload_case("zipf"))
+register_case("few_unique", workload_case("few_unique"))
+register_case("sawtooth", workload_case("sawtooth"))
+register_case("organ_pipe", workload_case("organ_pipe"), prefix=False)
+register_case("nearly_sorted", workload_case("nearly_sorted"))
+register_case("quick_killer", workload_case("quick_killer"), prefix=False)
+
+for _mode in ("classic", "hybrid", "intro", "3way"):
+    register_algorithm(
+        f"quicksort/{_mode}", lambda a, m=_mode: quickSort(a, 0, len(a) - 1, mode=m),
+        traced=lambda a, m=_mode: instrumented("Quick_sort").quickSort(a, 0, len(a) - 1, mode=m))
+# the numpy engines have no modes: one entry each, which get_algorithm()
+# returns for any mode name
+register_algorithm("quicksort", lambda a: numpy_backend.quickSort(a, 0, len(a) - 1), "numpy")
+
+for _mode in ("topdown", "hybrid", "bottomup", "natural"):
+    register_algorithm(
+        f"mergesort/{_mode}", lambda a, m=_mode: mergeSort(a, 0, len(a) - 1, mode=m),
+        traced=lambda a, m=_mode: instrumented("merge_sort").mergeSort(a, 0, len(a) - 1, mode=m))
+register_algorithm("mergesort", lambda a: numpy_backend.mergeSort(a, 0, len(a) - 1), "numpy")
+
+for _d in (2, 4, 8):
+    register_algorithm(f"heapsort/d{_d}", lambda a, d=_d: heapSort(a, d=d),
+                       traced=lambda a, d=_d: instrumented("Heap_sort").heapSort(a, d=d))
+register_algorithm("heapsort/d2", numpy_backend.heapSort, "numpy")
+
+register_algorithm("insertionsort", insertionSort,
+                   traced=lambda a: instrumented("insertion_sort").insertionSort(a))
+register_algorithm("insertionsort", numpy_backend.insertionSort, "numpy")
+register_algorithm(
+    "insertionsort/binary", lambda a: insertionSort(a, mode="binary"),
+    traced=lambda a: instrumented("insertion_sort").insertionSort(a, mode="binary"))
+
+
+def radix_algorithm(radix, mode="lsd"):
+    """Name of the radixSort(radix, mode) entry, registering it on first use.
+    The numpy entry uses radix 256 when the decimal radix is asked for."""
+    name = f"radixsort/r{radix}-{mode}"
+    if (name, "python") not in ALGORITHMS:
+        register_algorithm(name, lambda a: {"passes": radixSort(a, radix, mode)},
+                           traced=lambda a: instrumented("radix_sort").radixSort(a, radix, mode))
+        register_algorithm(
+            name, lambda a: {"passes": numpy_backend.radixSort(a, 256 if radix == 10 else radix)},
+            "numpy")
+    return name
+
+
+for _radix in (10, 256, 2048, 65536):
+    radix_algorithm(_radix, "lsd")
+    if _radix != 10:
+        radix_algorithm(_radix, "msd")
+
+# sort_dispatch.sort(); the "engine" column records what it picked
+register_algorithm("dispatch", lambda a: {"engine": sort_dispatch.sort(a)})
+register_algorithm("builtin", list.sort)
+
+# McIlroy adversary input against every quicksort mode, e.g. case
+# "antiqsort/quicksort/intro" (quadratic to build for modes the
+# adversary can drive to O(n^2)). Freezing the pivot candidate only
+# attacks partitioning: for insertion, merge or the built-in sort it
+# yields sorted input, their best case, so no case is made for them
+for _mode in QUICK_MODES:
+    register_case(f"antiqsort/quicksort/{_mode}",
+                  adversary_case(get_algorithm(f"quicksort/{_mode}").run), prefix=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark registered sorting algorithms.")
+    parser.add_argument("--algo", action="append",
+                        help="algorithm name, optionally name@backend (repeatable)")
+    parser.add_argument("--case", action="append", help="input case (repeatable)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 20_000, 40_000, 80_000, 100_000])
+    parser.add_argument("--count", action="store_true",
+                        help="also count comparisons (pure-Python algorithms)")
+    parser.add_argument("--out", help="also write {OUT}_results.csv/.md")
+    parser.add_argument("--list", action="store_true", help="list algorithms and cases")
+    add_timing_args(parser)
+    args = parser.parse_args()
+
+    if args.list or not args.algo:
+        print("algorithms:")
+        for name, backend in sorted(ALGORITHMS):
+            print(f"  {name}@{backend}")
+        print("cases:")
+        for name in sorted(CASES):
+            print(f"  {name}")
+        return
+
+    algorithms = []
+    for spec in args.algo:
+        name, _, backend = spec.partition("@")
+        algorithms.append(get_algorithm(name, backend or "python"))
+    cases = [(c, c) for c in (args.case or ["random"])]
+
+    rows = run(algorithms, cases, args.sizes, args.repeats, args.warmups, args.count,
+               ops=args.ops)
+    print(f"\n[Appended] {save_results(rows, args.store, args.tag)}")
+
+    if args.out:
+        columns = [("algorithm", "algorithm", "{}")] + BASE_COLUMNS + TIME_COLUMNS
+        if args.count:
+            columns.append(("cmps", "cmps", "{}"))
+        if args.ops:
+            columns += OP_COLUMNS
+        write_tables(args.out, rows, columns + ratio_columns(["nlogn", "n2"]))
+
+
+if __name__ == "__main__":
+    main()
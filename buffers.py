@@ -0,0 +1,78 @@
+# Helpers that let the sorts work in place on compact typed buffers,
+# an array.array (e.g. "q", "i", "d") or a 1-D memoryview, as well as
+# on lists.
+#
+# A list of n ints costs an 8-byte pointer plus a 28+ byte int object
+# per element; an array("q") costs 8 bytes. Scratch space for a typed
+# input is therefore a typed array of the same format, so merging or
+# scattering never boxes the elements. Slices of a memoryview are
+# views, not copies, so ranges that must survive being overwritten
+# are copied with sliceCopy().
+
+from array import array
+
+
+# array typecode / memoryview format of arr, None for a list
+def typecode(arr):
+    if isinstance(arr, array):
+        return arr.typecode
+    if isinstance(arr, memoryview):
+        return arr.format
+    return None
+
+# n zeroed slots of arr's type to merge or scatter its elements into
+# (a memoryview for a memoryview: an array slice only accepts arrays)
+def scratch(arr, n):
+    code = typecode(arr)
+    if code is None:
+        return [0] * n
+    buf = array(code, [0]) * n
+    return memoryview(buf) if isinstance(arr, memoryview) else buf
+
+# values as a list or an array of arr's type, ready to be slice
+# assigned into arr
+def like(arr, values):
+    code = typecode(arr)
+    if code is None:
+        return values if isinstance(values, list) else list(values)
+    return array(code, values)
+
+# An independent copy of arr[start:stop]
+def sliceCopy(arr, start, stop):
+    if isinstance(arr, memoryview):
+        out = array(arr.format)
+        out.frombytes(arr[start:stop].cast("B"))
+        return out
+    return arr[start:stop]
+
+
+if __name__ == "__main__":
+    import random
+
+    from Heap_sort import heapSort
+    from insertion_sort import insertionSort
+    from merge_sort import mergeSort
+    from Quick_sort import quickSort
+    from radix_sort import radixSort
+
+    sorts = {
+        "quick/intro":    lambda a: quickSort(a, 0, len(a) - 1, mode="intro"),
+        "merge/natural":  lambda a: mergeSort(a, 0, len(a) - 1, mode="natural"),
+        "merge/bottomup": lambda a: mergeSort(a, 0, len(a) - 1, mode="bottomup"),
+        "heap/d4":        lambda a: heapSort(a, d=4),
+        "insertion":      lambda a: insertionSort(a, mode="binary"),
+        "radix/r256":     lambda a: radixSort(a, 256),
+    }
+    for code in ("q", "i", "d"):
+        values = [random.randint(-10**6, 10**6) for _ in range(5000)]
+        if code == "d":
+            values = [v / 7 for v in values]
+        for name, run in sorts.items():
+            if code == "d" and name.startswith("radix"):
+                continue
+            a = array(code, values)
+            run(a)
+            b = array(code, values)
+            run(memoryview(b))
+            assert a.tolist() == b.tolist() == sorted(values), (code, name)
+    print("array / memoryview sorted in place by every sort:", True)
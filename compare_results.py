@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Compare two benchmark runs from the results store.
+
+Measurements are matched on algorithm, backend, case, n, Python
+version and machine fingerprint (benchmark.HISTORY_KEY). For each pair
+the timing samples are compared with a two-sided Mann-Whitney U test;
+a change is reported when it is significant (p < --alpha) and the
+medians differ by more than --threshold. The exit status is 1 when any
+regression is found, so this can gate changes to the sort kernels:
+
+    python analyze_radixsort.py --tag before
+    ... edit radix_sort.py ...
+    python analyze_radixsort.py --tag after
+    python compare_results.py --baseline before --current after
+"""
+
+import argparse
+import math
+import sys
+from functools import lru_cache
+
+import benchmark
+
+
+# ==============
+# Mann-Whitney U
+# ==============
+
+@lru_cache(maxsize=None)
+def _u_counts(m, n):
+    """Number of orderings of m x's and n y's giving each U = 0..m*n
+    (no ties), from N(u; m, n) = N(u - n; m - 1, n) + N(u; m, n - 1)."""
+    if m == 0 or n == 0:
+        return (1,)
+    a = _u_counts(m - 1, n)
+    b = _u_counts(m, n - 1)
+    out = [0] * (m * n + 1)
+    for u, c in enumerate(a):
+        out[u + n] += c
+    for u, c in enumerate(b):
+        out[u] += c
+    return tuple(out)
+
+
+def mann_whitney(x, y):
+    """Two-sided Mann-Whitney U test of samples x and y.
+
+    Returns (U of x, p-value). The exact null distribution is used for
+    small samples without ties, otherwise the normal approximation
+    with tie and continuity corrections.
+    """
+    m, n = len(x), len(y)
+    if m == 0 or n == 0:
+        raise ValueError("mann_whitney needs two non-empty samples")
+
+    # midranks of the pooled sample
+    pooled = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(pooled)
+    tieTerm = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tieTerm += t ** 3 - t
+        i = j + 1
+
+    rx = sum(r for r, (_, g) in zip(ranks, pooled) if g == 0)
+    u = rx - m * (m + 1) / 2
+    uMin = min(u, m * n - u)
+
+    if tieTerm == 0 and m * n <= 400:
+        counts = _u_counts(m, n)
+        tail = sum(counts[:int(uMin) + 1])
+        return u, min(1.0, 2 * tail / math.comb(m + n, m))
+
+    N = m + n
+    var = m * n / 12 * ((N + 1) - tieTerm / (N * (N - 1)))
+    if var == 0:
+        return u, 1.0
+    z = (abs(u - m * n / 2) - 0.5) / math.sqrt(var)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+# =========
+# Selection
+# =========
+
+def runs_in(records):
+    """Run ids in the order they were stored."""
+    seen = {}
+    for r in records:
+        seen.setdefault(r.get("run_id"), r)
+    return list(seen)
+
+
+def select(records, spec):
+    """Records of the runs matching spec: a tag, a run id, or
+    "latest" / "previous" (the last / second-to-last run)."""
+    if spec in ("latest", "previous"):
+        runs = runs_in(records)
+        k = 1 if spec == "latest" else 2
+        if len(runs) < k:
+            raise SystemExit(f"not enough runs in the store for {spec!r}")
+        wanted = {runs[-k]}
+    else:
+        wanted = {r.get("run_id") for r in records
+                  if spec in (r.get("tag"), r.get("run_id"))}
+        if not wanted:
+            raise SystemExit(f"no run tagged or with id {spec!r} in the store")
+
+    # later runs win when the same measurement appears more than once
+    out = {}
+    for r in records:
+        if r.get("run_id") in wanted and r.get("samples"):
+            out[benchmark.history_key(r)] = r
+    return out
+
+
+def compare(base, cur, alpha=0.05, threshold=0.05):
+    """One result dict per measurement present in both selections."""
+    results = []
+    for key in sorted(base.keys() & cur.keys(), key=str):
+        b, c = base[key], cur[key]
+        u, p = mann_whitney(b["samples"], c["samples"])
+        change = c["T_sec"] / b["T_sec"] - 1 if b["T_sec"] else 0.0
+        if p < alpha and abs(change) > threshold:
+            verdict = "regression" if change > 0 else "improvement"
+        else:
+            verdict = "same"
+        results.append({
+            **dict(zip(benchmark.HISTORY_KEY, key)),
+            "base_T": b["T_sec"],
+            "cur_T": c["T_sec"],
+            "change": change,
+            "p": p,
+            "verdict": verdict,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("--store", default=benchmark.STORE)
+    parser.add_argument("--baseline", default="previous",
+                        help="tag or run id of the baseline (default: second-to-last run)")
+    parser.add_argument("--current", default="latest",
+                        help="tag or run id to check (default: last run)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="significance level of the Mann-Whitney test")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="ignore median changes smaller than this fraction")
+    args = parser.parse_args()
+
+    records = benchmark.load_results(args.store)
+    if not records:
+        raise SystemExit(f"no results in {args.store}")
+    base = select(records, args.baseline)
+    cur = select(records, args.current)
+    results = compare(base, cur, args.alpha, args.threshold)
+    if not results:
+        raise SystemExit("the two runs share no measurement "
+                         "(same algorithm, case, n, Python and machine)")
+
+    print(f"baseline={args.baseline}  current={args.current}  "
+          f"alpha={args.alpha}  threshold={args.threshold:.0%}")
+    print("algorithm\t\tbackend\tcase\t\tn\tbase T(s)\tcur T(s)\tchange\tp\tverdict")
+    print("-" * 112)
+    for r in results:
+        print(f"{r['algorithm']:<20}\t{r['backend']}\t{r['case']:<12}\t{r['n']}\t"
+              f"{r['base_T']:.6f}\t{r['cur_T']:.6f}\t{r['change']:+.1%}\t"
+              f"{r['p']:.3f}\t{r['verdict']}")
+
+    regressions = sum(r["verdict"] == "regression" for r in results)
+    improvements = sum(r["verdict"] == "improvement" for r in results)
+    print(f"\n{len(results)} compared, {regressions} regressions, {improvements} improvements")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Fit benchmark sweeps to growth models.
+
+For every (algorithm, backend, case) in a list of benchmark rows, the
+time (and the instrumented operation counts, when present) is fitted to
+y = c * f(n) for each model in MODELS by least squares on relative
+error. Models are ranked by AIC and the Akaike weight of the winner is
+reported as its confidence. A log-log slope with a 95% interval is
+given as well, so e.g. an exponent of 2.0 +/- 0.05 with model "n^2"
+flags a quadratic case.
+
+adaptive_run() picks sweep sizes itself: it keeps doubling n until the
+best model has stayed the same for two rounds with enough confidence,
+or a size or time limit is hit.
+"""
+
+import argparse
+import math
+import sys
+
+import benchmark
+
+# growth models: f(n, row); "n*k" uses the number of digit passes
+# radix sort reports, so it only applies to rows that have one
+MODELS = {
+    "n": lambda n, row: n,
+    "n log n": lambda n, row: n * math.log2(n),
+    "n^2": lambda n, row: n * n,
+    "n*k": lambda n, row: n * row["passes"] if row.get("passes") else None,
+}
+
+# metrics fitted when present in the rows
+METRICS = ["T_sec", "op_cmps", "op_moves"]
+
+# two-sided 95% Student t quantiles by degrees of freedom
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+        8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
+
+
+def t95(df):
+    for k in sorted(_T95):
+        if df <= k:
+            return _T95[k]
+    return 1.96
+
+
+def loglog_slope(ns, ys):
+    """Slope of log y against log n and the half-width of its 95% interval."""
+    xs = [math.log(n) for n in ns]
+    ls = [math.log(y) for y in ys]
+    m = len(xs)
+    mx = sum(xs) / m
+    my = sum(ls) / m
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return float("nan"), float("nan")
+    b = sum((x - mx) * (l - my) for x, l in zip(xs, ls)) / sxx
+    if m < 3:
+        return b, float("nan")
+    resid = sum((l - my - b * (x - mx)) ** 2 for x, l in zip(xs, ls))
+    se = math.sqrt(resid / (m - 2) / sxx)
+    return b, t95(m - 2) * se
+
+
+def fit(points):
+    """Fit (n, y, row) points to every applicable model.
+
+    Returns a dict with the best model, its Akaike weight ("confidence"),
+    the scale factor c, and the log-log exponent with its 95% interval;
+    or None when there are fewer than three usable points.
+    """
+    points = [(n, y, row) for n, y, row in points if y is not None and y > 0]
+    if len(points) < 3:
+        return None
+    m = len(points)
+
+    scores = {}
+    for name, f in MODELS.items():
+        fs = [f(n, row) for n, _, row in points]
+        if any(v is None or v <= 0 for v in fs):
+            continue
+        # n*k with the same k at every size is just the n model again
+        if name == "n*k" and len({row["passes"] for _, _, row in points}) == 1:
+            continue
+        ys = [y for _, y, _ in points]
+        # minimize sum(((y - c f) / y)^2)
+        c = sum(fv / y for fv, y in zip(fs, ys)) / sum((fv / y) ** 2 for fv, y in zip(fs, ys))
+        rss = sum(((y - c * fv) / y) ** 2 for fv, y in zip(fs, ys))
+        # floor keeps exact fits (operation counts) finite
+        aic = m * math.log(max(rss / m, 1e-12)) + 2
+        scores[name] = (aic, c, math.sqrt(rss / m))
+
+    best = min(scores, key=lambda k: scores[k][0])
+    weights = {k: math.exp(-(v[0] - scores[best][0]) / 2) for k, v in scores.items()}
+    total = sum(weights.values())
+    slope, ci = loglog_slope([n for n, _, _ in points], [y for _, y, _ in points])
+    return {
+        "model": best,
+        "confidence": weights[best] / total,
+        "c": scores[best][1],
+        "rel_err": scores[best][2],
+        "exponent": slope,
+        "exponent_ci": ci,
+        "runner_up": min((k for k in scores if k != best),
+                         key=lambda k: scores[k][0], default=None),
+    }
+
+
+def fit_rows(rows, metrics=METRICS):
+    """One fit per (algorithm, backend, case, metric) found in rows."""
+    groups = {}
+    for r in rows:
+        groups.setdefault((r["algorithm"], r["backend"], r["case"]), []).append(r)
+
+    fits = []
+    for (algo, backend, case), group in groups.items():
+        group.sort(key=lambda r: r["n"])
+        for metric in metrics:
+            result = fit([(r["n"], r.get(metric), r) for r in group])
+            if result:
+                fits.append({"algorithm": algo, "backend": backend, "case": case,
+                             "metric": metric, "sizes": [r["n"] for r in group], **result})
+    return fits
+
+
+def report(rows, metrics=METRICS, log=print):
+    """Print the fits for rows; quadratic ones are marked with "!!"."""
+    fits = fit_rows(rows, metrics)
+    if not fits:
+        return fits
+    log("\nComplexity fit (y = c * f(n), ranked by AIC):")
+    log("algorithm\t\tbackend\tcase\t\tmetric\t\tmodel\t\tconf\texponent\trel.err")
+    log("-" * 112)
+    for f in fits:
+        mark = "  !!" if f["model"] == "n^2" else ""
+        log(f"{f['algorithm']:<20}\t{f['backend']}\t{f['case']:<12}\t{f['metric']:<10}\t"
+            f"{f['model']:<8}\t{f['confidence']:.2f}\t"
+            f"{f['exponent']:.2f} +/- {f['exponent_ci']:.2f}\t{f['rel_err']:.1%}{mark}")
+    return fits
+
+
+def adaptive_run(algorithms, cases, sizes=(1_000, 2_000, 4_000), max_n=100_000,
+                 max_seconds=10.0, min_confidence=0.9, metric="T_sec", **run_args):
+    """benchmark.run() with sizes chosen per (algorithm, case).
+
+    Starts from `sizes` and doubles the largest n while the best model
+    for `metric` is still changing between rounds or its confidence is
+    below min_confidence. Stops at max_n, or once one measurement takes
+    longer than max_seconds. run_args (repeats, warmups, ops, ...) go
+    to benchmark.run(). Returns all rows measured.
+    """
+    repeats = run_args.get("repeats", benchmark.REPEATS)
+    rows = []
+    for label, case in cases:
+        for algo in algorithms:
+            group = benchmark.run([algo], [(label, case)], list(sizes), **run_args)
+            previous = None
+            while True:
+                result = fit([(r["n"], r.get(metric), r) for r in group])
+                stable = (result is not None and previous is not None
+                          and result["model"] == previous["model"]
+                          and result["confidence"] >= min_confidence)
+                n = group[-1]["n"] * 2
+                if stable or n > max_n or group[-1]["T_sec"] * repeats > max_seconds:
+                    break
+                previous = result
+                group += benchmark.run([algo], [(label, case)], [n], **run_args)
+            rows += group
+    return rows
+
+
+def add_sweep_args(parser):
+    parser.add_argument("--adaptive", action="store_true",
+                        help="choose the sizes per algorithm and case by doubling n "
+                             "until the complexity fit is stable")
+    parser.add_argument("--max-n", type=int, default=100_000,
+                        help="largest n an adaptive sweep may reach")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive complexity check of one algorithm.")
+    parser.add_argument("--algo", required=True, help="algorithm name, optionally name@backend")
+    parser.add_argument("--case", action="append", help="input case (repeatable)")
+    parser.add_argument("--metric", default="T_sec", choices=METRICS,
+                        help="quantity whose fit decides when the sweep stops")
+    parser.add_argument("--max-n", type=int, default=100_000)
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="stop growing n once one measurement takes this long")
+    benchmark.add_timing_args(parser)
+    args = parser.parse_args()
+
+    # classic quicksort recurses n deep on its worst case
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * args.max_n + 1000))
+
+    name, _, backend = args.algo.partition("@")
+    algo = benchmark.get_algorithm(name, backend or "python")
+    cases = [(c, c) for c in (args.case or ["random"])]
+    ops = args.ops or args.metric != "T_sec"
+
+    rows = adaptive_run([algo], cases, max_n=args.max_n, max_seconds=args.max_seconds,
+                        metric=args.metric, repeats=args.repeats, warmups=args.warmups, ops=ops)
+    benchmark.save_results(rows, args.store, args.tag)
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
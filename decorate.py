@@ -0,0 +1,115 @@
+# Decorate-sort-undecorate helpers behind the key= / reverse= /
+# stable= parameters of the five sorts.
+#
+# The key function is called once per element. Elements of the range
+# are replaced by (key, index) pairs, the pairs are sorted with the
+# plain algorithm, and the elements are put back in the new order.
+# Since no two pairs are equal, the algorithm never compares the
+# elements themselves, and the result is stable even for quickSort and
+# heapSort. reverse=True decorates with (key, -index) and reverses the
+# sorted pairs, which gives descending keys with ties still in their
+# original order (the same guarantee as sorted(..., reverse=True)).
+#
+# Stability without decoration:
+#   insertionSort, mergeSort (all modes), radixSort "lsd"  stable
+#   quickSort, heapSort, radixSort "msd"                   not stable
+#                                   (pass stable=True / a key to get it)
+#
+# radixSort keys must be integers. They are extracted once into a
+# compact array and folded with the index into one non-negative int,
+# (key - min) * n + index, so the radix passes still only see ints.
+
+from array import array
+
+from buffers import like, sliceCopy
+
+
+# Sort arr[low..high] by key with sorter(a, lo, hi), a plain in-place
+# sort of a list over an inclusive range (keys: the keys of the range,
+# if the caller has already computed them)
+def sortDecorated(arr, low, high, sorter, key=None, reverse=False, keys=None):
+    if high - low < 1:
+        return
+    items = arr[low:high + 1]
+    if keys is None:
+        keys = items if key is None else list(map(key, items))
+
+    sign = -1 if reverse else 1
+    dec = [(k, sign * i) for i, k in enumerate(keys)]
+    sorter(dec, 0, len(dec) - 1)
+    if reverse:
+        dec.reverse()
+
+    arr[low:high + 1] = like(arr, [items[sign * i] for _, i in dec])
+
+
+# Radix sort arr (whole list) by integer keys with sorter(ints), a
+# plain radix sort of non-negative ints; stable in both directions
+# (keys as in sortDecorated)
+def sortByIntKey(arr, sorter, key=None, reverse=False, keys=None):
+    n = len(arr)
+    if n < 2:
+        return
+    items = sliceCopy(arr, 0, n)
+    # key is called once per element; the list is dropped once the
+    # keys fit in the compact array
+    if keys is None:
+        keys = items if key is None else list(map(key, items))
+    try:
+        keys = array("q", keys)
+    except OverflowError:
+        # wider than 64 bits: a list of ints works the same way
+        keys = list(keys)
+    except TypeError:
+        raise TypeError("radixSort keys must be integers") from None
+
+    if reverse:
+        top = max(keys)
+        packed = [(top - k) * n + i for i, k in enumerate(keys)]
+    else:
+        low = min(keys)
+        packed = [(k - low) * n + i for i, k in enumerate(keys)]
+    sorter(packed)
+
+    arr[:] = like(arr, [items[p % n] for p in packed])
+
+
+if __name__ == "__main__":
+    import random
+
+    from Quick_sort import quickSort
+    from merge_sort import mergeSort
+    from Heap_sort import heapSort
+    from insertion_sort import insertionSort
+    from radix_sort import radixSort
+
+    # records with many equal keys; the second field tells equal keys apart
+    recs = [(random.randint(-20, 20), i) for i in range(2000)]
+    byKey = lambda r: r[0]
+
+    calls = {
+        "quick/classic": lambda a, **kw: quickSort(a, 0, len(a) - 1, **kw),
+        "quick/intro":   lambda a, **kw: quickSort(a, 0, len(a) - 1, mode="intro", **kw),
+        "quick/3way":    lambda a, **kw: quickSort(a, 0, len(a) - 1, mode="3way", **kw),
+        "merge/topdown": lambda a, **kw: mergeSort(a, 0, len(a) - 1, **kw),
+        "merge/natural": lambda a, **kw: mergeSort(a, 0, len(a) - 1, mode="natural", **kw),
+        "heap/d2":       lambda a, **kw: heapSort(a, **kw),
+        "heap/d4":       lambda a, **kw: heapSort(a, d=4, **kw),
+        "insertion":     lambda a, **kw: insertionSort(a, **kw),
+        "radix/r10":     lambda a, **kw: radixSort(a, **kw),
+        "radix/r256msd": lambda a, **kw: radixSort(a, 256, "msd", **kw),
+    }
+    for name, call in calls.items():
+        for reverse in (False, True):
+            a = list(recs)
+            call(a, key=byKey, reverse=reverse)
+            # sorted() is stable, so this also checks stability
+            assert a == sorted(recs, key=byKey, reverse=reverse), (name, reverse)
+    print("key= / reverse= stable for all sorts:", True)
+
+    # sub-range with a key only touches that range
+    a = list(recs)
+    quickSort(a, 100, 199, key=byKey)
+    assert a[:100] == recs[:100] and a[200:] == recs[200:]
+    assert a[100:200] == sorted(recs[100:200], key=byKey)
+    print("sub-range sorted by key:", True)
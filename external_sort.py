@@ -0,0 +1,341 @@
+# External merge sort for integer files larger than memory.
+#
+# The input is a text file with one integer per line (the format
+# save_array_txt writes). It is read in chunks that fit the memory
+# budget; each chunk is sorted in memory and spilled to a temporary
+# run file in the binary array format of gen_quicksort_cases
+# (SORTARR1 header + int64 payload). The runs are then merged,
+# fanIn at a time, into the output.
+#
+# The merge keeps one buffered block per run and a min-heap keyed by
+# the last value of every block. Everything up to the heap top is
+# safe to emit: no run can still produce a smaller value. So each
+# step emits a whole batch, sorted from the runs' block prefixes with
+# one bulk sort (Timsort / NumPy's stable sort both merge presorted
+# runs), instead of pushing single elements through the heap.
+# The run whose block ran out is refilled and pushed back.
+#
+# Chunks are sorted with numpy_backend.radixSort when NumPy is
+# installed, and with the built-in list sort otherwise.
+
+import heapq
+import os
+import tempfile
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+
+from gen_quicksort_cases import BIN_HEADER, BIN_MAGIC, read_array_header
+import numpy_backend
+
+np = numpy_backend.np
+
+# rough bytes per element while a chunk is parsed and sorted
+# (NumPy: int64 data plus radix keys and argsort indices; Python: an
+# int object and its list slot on top of the 8-byte run buffer)
+BYTES_PER_ITEM_NUMPY = 32
+BYTES_PER_ITEM_PYTHON = 48
+
+# merge at most this many runs at once (open files, buffer size)
+MAX_FAN_IN = 64
+# smallest per-run merge buffer, in elements
+MIN_BUFFER = 4096
+
+DEFAULT_MEMORY = 64 * 2 ** 20
+
+
+# ==========
+# Run files
+# ==========
+
+# Streaming writer of a binary array file; the length and checksum
+# in the header are filled in when it is closed
+class RunWriter:
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.n = 0
+        self.crc = 0
+        self.f.write(self.header())
+        self.f.write(b"{}")
+        self.f.write(b"\0" * (-(BIN_HEADER.size + 2) % 8))
+
+    def header(self):
+        return BIN_HEADER.pack(BIN_MAGIC, b"q\0", 8, self.n, self.crc, 2)
+
+    # block: array("q") or an int64 ndarray
+    def write(self, block):
+        payload = memoryview(block).cast("B")
+        self.crc = zlib.crc32(payload, self.crc)
+        self.f.write(payload)
+        self.n += len(block)
+
+    def close(self):
+        self.f.seek(0)
+        self.f.write(self.header())
+        self.f.close()
+
+
+# Buffered reader of a binary array file written by RunWriter or
+# save_array_bin; the checksum is verified when the end is reached
+class RunReader:
+    def __init__(self, path, useNumpy):
+        info = read_array_header(path)
+        if info["typecode"] != "q":
+            raise ValueError(f"{path}: expected int64 data, got {info['typecode']!r}")
+        self.f = open(path, "rb")
+        self.f.seek(info["offset"])
+        self.left = info["length"]
+        self.expected = info["crc32"]
+        self.crc = 0
+        self.path = path
+        self.useNumpy = useNumpy
+
+    # next block of at most count elements (empty at the end)
+    def read(self, count):
+        count = min(count, self.left)
+        raw = self.f.read(count * 8)
+        if len(raw) != count * 8:
+            raise ValueError(f"{self.path}: truncated run file")
+        self.crc = zlib.crc32(raw, self.crc)
+        self.left -= count
+        if self.left == 0 and self.crc != self.expected:
+            raise ValueError(f"{self.path}: checksum mismatch")
+        if self.useNumpy:
+            return np.frombuffer(raw, dtype=np.int64)
+        block = array("q")
+        block.frombytes(raw)
+        return block
+
+    def close(self):
+        self.f.close()
+
+
+# Streaming text output, one integer per line
+class TextWriter:
+    def __init__(self, path):
+        self.f = open(path, "w", buffering=2 ** 20)
+
+    def write(self, block):
+        if len(block):
+            values = block.tolist() if hasattr(block, "tolist") else block
+            self.f.write("\n".join(map(str, values)))
+            self.f.write("\n")
+
+    def close(self):
+        self.f.close()
+
+
+# ============
+# Chunk phase
+# ============
+
+# Yield the integers of a text file as blocks of about blockBytes of
+# text each (array("q") or int64 ndarray); blank lines are skipped
+def readTextBlocks(path, blockBytes, useNumpy):
+    with open(path, "rb") as f:
+        carry = b""
+        while True:
+            data = f.read(blockBytes)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield parseInts(data[:cut], useNumpy)
+        if carry.strip():
+            yield parseInts(carry, useNumpy)
+
+
+def parseInts(text, useNumpy):
+    words = text.split()
+    try:
+        if useNumpy:
+            return np.array(words, dtype=np.int64)
+        return array("q", map(int, words))
+    except OverflowError:
+        raise ValueError("external sort handles 64-bit integers only") from None
+
+
+# Sort one chunk (a list of parsed blocks) and return it as one block
+def sortChunk(blocks, useNumpy):
+    if useNumpy:
+        chunk = np.concatenate(blocks)
+        numpy_backend.radixSort(chunk)
+        return chunk
+    chunk = []
+    for b in blocks:
+        chunk.extend(b)
+    chunk.sort()
+    return array("q", chunk)
+
+
+# ============
+# Merge phase
+# ============
+
+# Merge the run files `paths` into writer, bufItems elements per run
+def mergeRuns(paths, writer, bufItems, useNumpy):
+    readers = [RunReader(p, useNumpy) for p in paths]
+    bufs = [None] * len(readers)
+    pos = [0] * len(readers)
+
+    # heap of (last buffered value, run)
+    heap = []
+    for r, reader in enumerate(readers):
+        block = reader.read(bufItems)
+        if len(block):
+            bufs[r] = block
+            heap.append((block[-1], r))
+    heapq.heapify(heap)
+
+    try:
+        while heap:
+            bound = heap[0][0]
+
+            # every buffered value <= bound can go out now
+            parts = []
+            for r, buf in enumerate(bufs):
+                if buf is None:
+                    continue
+                if useNumpy:
+                    cut = pos[r] + int(np.searchsorted(buf[pos[r]:], bound, side="right"))
+                else:
+                    cut = bisect_right(buf, bound, pos[r])
+                if cut > pos[r]:
+                    parts.append(buf[pos[r]:cut])
+                    pos[r] = cut
+
+            if len(parts) == 1:
+                writer.write(parts[0])
+            elif useNumpy:
+                writer.write(np.sort(np.concatenate(parts), kind="stable"))
+            else:
+                out = []
+                for p in parts:
+                    out.extend(p)
+                out.sort()
+                writer.write(array("q", out))
+
+            # refill every run whose block is used up (at least the top)
+            while heap and pos[heap[0][1]] == len(bufs[heap[0][1]]):
+                r = heap[0][1]
+                block = readers[r].read(bufItems)
+                pos[r] = 0
+                if len(block):
+                    bufs[r] = block
+                    heapq.heapreplace(heap, (block[-1], r))
+                else:
+                    bufs[r] = None
+                    heapq.heappop(heap)
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+# Sort the integers in text file inPath into outPath (text, or the
+# binary run format with binary=True) using about `memory` bytes.
+# tmpDir holds the run files (default: the system temp dir).
+# Returns a dict with the element count, number of runs and of merge
+# passes, input size in bytes and the elapsed seconds.
+def externalSort(inPath, outPath, memory=DEFAULT_MEMORY, tmpDir=None,
+                 binary=False, useNumpy=None):
+    start = time.perf_counter()
+    if useNumpy is None:
+        useNumpy = np is not None
+    elif useNumpy:
+        numpy_backend.requireNumpy()
+
+    perItem = BYTES_PER_ITEM_NUMPY if useNumpy else BYTES_PER_ITEM_PYTHON
+    chunkItems = max(MIN_BUFFER, memory // perItem)
+    # text of a block is ~7-11 bytes per element; keep blocks well
+    # under a chunk so parsing does not overshoot the budget much
+    blockBytes = max(2 ** 16, min(2 ** 22, memory // 16))
+
+    def openOutput():
+        return RunWriter(outPath) if binary else TextWriter(outPath)
+
+    stats = {"n": 0, "runs": 0, "passes": 0, "bytes": os.path.getsize(inPath)}
+    with tempfile.TemporaryDirectory(prefix="extsort-", dir=tmpDir) as tmp:
+        runs = []
+        blocks = []
+        items = 0
+
+        def spill():
+            path = os.path.join(tmp, f"run{len(runs)}.bin")
+            w = RunWriter(path)
+            w.write(sortChunk(blocks, useNumpy))
+            w.close()
+            runs.append(path)
+
+        for block in readTextBlocks(inPath, blockBytes, useNumpy):
+            blocks.append(block)
+            items += len(block)
+            stats["n"] += len(block)
+            if items >= chunkItems:
+                spill()
+                blocks, items = [], 0
+
+        # everything fit in one chunk: no run files needed
+        if not runs:
+            w = openOutput()
+            if blocks:
+                w.write(sortChunk(blocks, useNumpy))
+            w.close()
+            stats["seconds"] = time.perf_counter() - start
+            return stats
+
+        if blocks:
+            spill()
+            blocks = []
+        stats["runs"] = len(runs)
+
+        # merge passes until one pass can write the output
+        fanIn = max(2, min(MAX_FAN_IN, memory // (perItem * MIN_BUFFER) - 1))
+        generation = 0
+        while True:
+            stats["passes"] += 1
+            if len(runs) <= fanIn:
+                bufItems = max(MIN_BUFFER, memory // (perItem * (len(runs) + 1)))
+                w = openOutput()
+                mergeRuns(runs, w, bufItems, useNumpy)
+                w.close()
+                break
+
+            bufItems = max(MIN_BUFFER, memory // (perItem * (fanIn + 1)))
+            merged = []
+            for i in range(0, len(runs), fanIn):
+                group = runs[i:i + fanIn]
+                path = os.path.join(tmp, f"merge{generation}_{i // fanIn}.bin")
+                w = RunWriter(path)
+                mergeRuns(group, w, bufItems, useNumpy)
+                w.close()
+                for p in group:
+                    os.remove(p)
+                merged.append(path)
+            runs = merged
+            generation += 1
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+if __name__ == "__main__":
+    import random
+
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "in.txt")
+        dst = os.path.join(d, "out.txt")
+        arr = [random.randint(-10**12, 10**12) for _ in range(200_000)]
+        with open(src, "w") as f:
+            f.write("\n".join(map(str, arr)) + "\n")
+
+        # a small budget forces several runs and merge passes
+        stats = externalSort(src, dst, memory=2 ** 20)
+        with open(dst) as f:
+            out = [int(line) for line in f]
+        print(stats)
+        print("Sorted correctly:", out == sorted(arr))
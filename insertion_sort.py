@@ -1,18 +1,56 @@
 # Python program for implementation of Insertion Sort
+from bisect import bisect_right
+
+from decorate import sortDecorated
 
 # Function to sort array using insertion sort
-def insertionSort(arr):
-    for i in range(1, len(arr)):
-        key = arr[i]
+# (sorts arr[low..high], the whole array by default, so it
+# can also be used to finish small ranges inside other sorts).
+# mode "linear" scans and shifts one element at a time,
+# mode "binary" runs binaryInsertionSort() (bisect + one slice move).
+# Both are stable; key= / reverse= work as in sorted() (see decorate.py)
+def insertionSort(arr, low=0, high=None, key=None, reverse=False, mode="linear"):
+    if high is None:
+        high = len(arr) - 1
+    if mode not in ("linear", "binary"):
+        raise ValueError(f"unknown insertion sort mode: {mode!r}")
+    if key is not None or reverse:
+        sortDecorated(arr, low, high,
+                      lambda a, lo, hi: insertionSort(a, lo, hi, mode=mode), key, reverse)
+        return
+    if mode == "binary":
+        binaryInsertionSort(arr, low, high)
+        return
+
+    for i in range(low + 1, high + 1):
+        item = arr[i]
         j = i - 1
 
-        # Move elements of arr[0..i-1], that are
-        # greater than key, to one position ahead
+        # Move elements of arr[low..i-1], that are
+        # greater than item, to one position ahead
         # of their current position
-        while j >= 0 and key < arr[j]:
+        while j >= low and item < arr[j]:
             arr[j + 1] = arr[j]
             j -= 1
-        arr[j + 1] = key
+        arr[j + 1] = item
+
+# Binary insertion sort of arr[low..high], assuming arr[low..start-1]
+# is already sorted. The insert position is found with bisect and the
+# block is shifted with one slice assignment. Equal keys keep their
+# order (bisect_right), so the sort is stable. Still O(n^2) moves, but
+# they happen at C speed and only O(n log n) comparisons are made.
+def binaryInsertionSort(arr, low=0, high=None, start=None):
+    if high is None:
+        high = len(arr) - 1
+    if start is None or start <= low:
+        start = low + 1
+
+    for i in range(start, high + 1):
+        key = arr[i]
+        pos = bisect_right(arr, key, low, i)
+        if pos < i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
 
 # A utility function to print array of size n
 def printArray(arr):
@@ -26,4 +64,8 @@ if __name__ == "__main__":
     insertionSort(arr)
     printArray(arr)
 
-    # This code is contributed by Hritik Shah.
\ No newline at end of file
+    arr = [12, 11, 13, 5, 6]
+    insertionSort(arr, mode="binary")
+    printArray(arr)
+
+    # This code is contributed by Hritik Shah.
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Operation counting for the pure-Python sorts, at no cost when unused.
+
+instrumented("Quick_sort") parses Quick_sort.py, rewrites its functions
+with the ast module and executes the result as a separate module
+object, so the regular module keeps no counters in its hot loops. The
+rewritten copy reports to the shared COUNTS object:
+
+  cmps         comparisons with an array element on either side, i.e. an
+               element-array subscript such as arr[j], or a local that
+               was assigned one (key = arr[i]); index tests like i < n
+               are not counted
+  moves        element writes into an array: arr[k] = x counts 1, a
+               slice store arr[a:b] = buf counts len(buf)
+  swaps        exchange statements arr[i], arr[j] = arr[j], arr[i]
+               (each also counts as 2 moves)
+  allocs       auxiliary lists created: [0] * n, slices, comprehensions,
+               list()/array()/.copy() calls
+  alloc_elems  total length of those lists
+  depth        deepest recursion of any single function
+
+Element arrays are recognized by name (ELEMENT_ARRAYS). Imports of
+other project modules (from Heap_sort import heapSort) are bound to
+their instrumented copies, so fallbacks are counted too, and
+bisect_left / bisect_right are bound to pure-Python versions that make
+the same probes as the C ones and count each as a comparison.
+Comparisons inside other C helpers (min, max) are not seen.
+
+    from instrument import instrumented, count_ops
+    qs = instrumented("Quick_sort")
+    print(count_ops(lambda: qs.quickSort(arr, 0, len(arr) - 1, mode="intro")))
+"""
+
+import ast
+import importlib.util
+import os
+import types
+
+# names under which the sorts keep their element arrays
+ELEMENT_ARRAYS = {"arr", "a", "src", "dst", "L", "R", "heap", "output", "buf", "keys", "tmp"}
+
+# calls that build a fresh list
+ALLOC_CALLS = {"list", "array", "sorted"}
+
+FIELDS = ("cmps", "moves", "swaps", "allocs", "alloc_elems", "depth")
+
+# bumped whenever what the counters mean changes, and stored with every
+# op-count row so history from different versions is not compared:
+#   1  comparisons inside bisect were not counted, so cmps undercounted
+#      binary insertion sort and, once it became their finisher, the
+#      hybrid quick / merge sorts (by 13-17% on random ints)
+#   2  bisect comparisons are counted
+VERSION = 2
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class OpCounts:
+    """Counters updated by instrumented code."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for f in FIELDS:
+            setattr(self, f, 0)
+        self.active = {}
+
+    def snapshot(self):
+        return {f: getattr(self, f) for f in FIELDS}
+
+    # ---- hooks called from rewritten code ----
+
+    def cmp(self, result):
+        self.cmps += 1
+        return result
+
+    def move(self, k=1):
+        self.moves += k
+
+    def swap(self):
+        self.swaps += 1
+        self.moves += 2
+
+    def store(self, value):
+        # value of a slice store: count its length, keep it usable
+        if not hasattr(value, "__len__"):
+            value = list(value)
+        self.moves += len(value)
+        return value
+
+    def alloc(self, value):
+        self.allocs += 1
+        try:
+            self.alloc_elems += len(value)
+        except TypeError:
+            pass
+        return value
+
+    def enter(self, name):
+        d = self.active.get(name, 0) + 1
+        self.active[name] = d
+        if d > self.depth:
+            self.depth = d
+
+    def leave(self, name):
+        self.active[name] -= 1
+
+
+COUNTS = OpCounts()
+
+
+def count_ops(call):
+    """Reset COUNTS, run call() and return the counts as a dict."""
+    COUNTS.reset()
+    call()
+    return COUNTS.snapshot()
+
+
+# counting stand-ins for the C bisect functions: the same binary
+# search, so the same number of comparisons
+
+def _bisect_right(a, x, lo=0, hi=None):
+    if hi is None:
+        hi = len(a)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if COUNTS.cmp(x < a[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _bisect_left(a, x, lo=0, hi=None):
+    if hi is None:
+        hi = len(a)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if COUNTS.cmp(a[mid] < x):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+COUNTING_HELPERS = {
+    "bisect": {"bisect_left": _bisect_left, "bisect_right": _bisect_right,
+               "bisect": _bisect_right},
+}
+
+
+# =================
+# The AST rewriting
+# =================
+
+def _hook(name, *args):
+    return ast.Call(
+        func=ast.Attribute(value=ast.Name(id="_ops", ctx=ast.Load()), attr=name, ctx=ast.Load()),
+        args=list(args), keywords=[])
+
+
+def _is_slice(node):
+    return isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice)
+
+
+def _is_element_ref(node):
+    return (isinstance(node, ast.Subscript) and not _is_slice(node)
+            and isinstance(node.value, ast.Name) and node.value.id in ELEMENT_ARRAYS)
+
+
+def _element_scalars(func):
+    """Locals of func that hold an array element: assigned from an
+    element subscript, or looping over an element array."""
+    names = set()
+    for node in ast.walk(func):
+        if isinstance(node, ast.Assign):
+            values = node.value.elts if isinstance(node.value, ast.Tuple) else [node.value]
+            for target in node.targets:
+                targets = target.elts if isinstance(target, ast.Tuple) else [target]
+                if len(targets) == len(values):
+                    pairs = zip(targets, values)
+                else:
+                    pairs = ((t, node.value) for t in targets)
+                for t, v in pairs:
+                    if isinstance(t, ast.Name) and _is_element_ref(v):
+                        names.add(t.id)
+        elif isinstance(node, ast.For):
+            if (isinstance(node.target, ast.Name) and isinstance(node.iter, ast.Name)
+                    and node.iter.id in ELEMENT_ARRAYS):
+                names.add(node.target.id)
+    return names
+
+
+class _Rewriter(ast.NodeTransformer):
+
+    def __init__(self):
+        self.scalars = [set()]
+
+    def _is_element(self, node):
+        return _is_element_ref(node) or (isinstance(node, ast.Name) and node.id in self.scalars[-1])
+
+    def visit_FunctionDef(self, node):
+        self.scalars.append(self.scalars[-1] | _element_scalars(node))
+        self.generic_visit(node)
+        self.scalars.pop()
+
+        name = ast.Constant(node.name)
+        node.body = [
+            ast.Expr(_hook("enter", name)),
+            ast.Try(body=node.body, handlers=[], orelse=[],
+                    finalbody=[ast.Expr(_hook("leave", ast.Constant(node.name)))]),
+        ]
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if any(self._is_element(x) for x in [node.left] + node.comparators):
+            return _hook("cmp", node)
+        return node
+
+    def visit_Subscript(self, node):
+        self.generic_visit(node)
+        if _is_slice(node) and isinstance(node.ctx, ast.Load):
+            return _hook("alloc", node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Mult) and (isinstance(node.left, ast.List)
+                                               or isinstance(node.right, ast.List)):
+            return _hook("alloc", node)
+        return node
+
+    def visit_ListComp(self, node):
+        self.generic_visit(node)
+        return _hook("alloc", node)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        f = node.func
+        if ((isinstance(f, ast.Name) and f.id in ALLOC_CALLS)
+                or (isinstance(f, ast.Attribute) and f.attr == "copy")):
+            return _hook("alloc", node)
+        return node
+
+    def visit_Assign(self, node):
+        targets = [t for target in node.targets
+                   for t in (target.elts if isinstance(target, ast.Tuple) else [target])]
+        swap = (len(node.targets) == 1 and isinstance(node.targets[0], ast.Tuple)
+                and isinstance(node.value, ast.Tuple)
+                and len(targets) == 2 and all(_is_element_ref(t) for t in targets)
+                and [ast.unparse(v) for v in node.value.elts]
+                == [ast.unparse(targets[1]), ast.unparse(targets[0])])
+
+        self.generic_visit(node)
+        # slice stores count what they copy
+        if any(_is_slice(t) and isinstance(t.value, ast.Name) and t.value.id in ELEMENT_ARRAYS
+               for t in targets):
+            node.value = _hook("store", node.value)
+
+        if swap:
+            return [node, ast.Expr(_hook("swap"))]
+        k = sum(1 for t in targets if _is_element_ref(t))
+        if k:
+            return [node, ast.Expr(_hook("move", ast.Constant(k)))]
+        return node
+
+    def visit_AugAssign(self, node):
+        self.generic_visit(node)
+        if _is_element_ref(node.target):
+            return [node, ast.Expr(_hook("move"))]
+        return node
+
+
+# ===========
+# The loader
+# ===========
+
+_cache = {}
+
+
+def _project_module(name):
+    return os.path.exists(os.path.join(HERE, name.replace(".", os.sep) + ".py"))
+
+
+def instrumented(module_name):
+    """Counting copy of the project module `module_name` (cached)."""
+    if module_name in _cache:
+        return _cache[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None:
+        raise ImportError(f"cannot find module {module_name!r}")
+    with open(spec.origin) as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+
+    tree = ast.fix_missing_locations(_Rewriter().visit(tree))
+    code = compile(tree, f"{spec.origin} [instrumented]", "exec")
+
+    mod = types.ModuleType(f"{module_name}[instrumented]")
+    mod.__file__ = spec.origin
+    mod._ops = COUNTS
+    _cache[module_name] = mod
+    try:
+        exec(code, mod.__dict__)
+    except BaseException:
+        del _cache[module_name]
+        raise
+
+    # route calls into other project modules through their counting
+    # copies, and C helpers that compare elements through counting ones
+    for node in tree.body:
+        if not (isinstance(node, ast.ImportFrom) and node.module and node.level == 0):
+            continue
+        if node.module in COUNTING_HELPERS:
+            helpers = COUNTING_HELPERS[node.module]
+            for alias in node.names:
+                if alias.name in helpers:
+                    setattr(mod, alias.asname or alias.name, helpers[alias.name])
+        elif _project_module(node.module):
+            other = instrumented(node.module)
+            for alias in node.names:
+                setattr(mod, alias.asname or alias.name, getattr(other, alias.name))
+    return mod
+
+
+if __name__ == "__main__":
+    import random
+
+    arr = [random.randint(0, 10**6) for _ in range(10_000)]
+    for module, call in [
+        ("Quick_sort",     lambda m, a: m.quickSort(a, 0, len(a) - 1, mode="intro")),
+        ("merge_sort",     lambda m, a: m.mergeSort(a, 0, len(a) - 1)),
+        ("Heap_sort",      lambda m, a: m.heapSort(a)),
+        ("insertion_sort", lambda m, a: m.insertionSort(a[:2000])),
+        ("radix_sort",     lambda m, a: m.radixSort(a)),
+    ]:
+        a = list(arr)
+        counts = count_ops(lambda: call(instrumented(module), a))
+        print(f"{module:<15}", counts)
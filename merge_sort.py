@@ -1,9 +1,26 @@
+from bisect import bisect_left, bisect_right
+
+from buffers import scratch, sliceCopy
+from decorate import sortDecorated
+from insertion_sort import binaryInsertionSort, insertionSort
+import tuning
+
+# natural merge sort: ranges shorter than this are not split into runs
+MIN_MERGE = 32
+
+# hybrid merge sort: ranges of at most this many elements are
+# binary insertion sorted (calibrated per machine by tune_cutoffs.py)
+MERGE_CUTOFF = tuning.get("merge_cutoff")
+
+# consecutive wins needed before a merge switches to galloping
+MIN_GALLOP = 7
+
 def merge(arr, l, m, r):
     n1 = m - l + 1
     n2 = r - m
 
-    L = [0] * n1
-    R = [0] * n2
+    L = scratch(arr, n1)
+    R = scratch(arr, n2)
 
     for i in range(n1):
         L[i] = arr[l + i]
@@ -31,15 +48,309 @@ def merge(arr, l, m, r):
         j += 1
         k += 1
 
-def mergeSort(arr, l, r):
+# Merge the sorted runs src[so+lo..so+m] and src[so+m+1..so+hi]
+# into dst[do+lo..do+hi]. so/do are the offsets of the sorted
+# range inside src and dst, lo/m/hi are relative to them.
+def mergeInto(src, so, dst, do, lo, m, hi):
+    i = so + lo
+    iend = so + m
+    j = iend + 1
+    jend = so + hi
+    k = do + lo
+
+    # runs already in order: just move them across
+    if src[iend] <= src[j]:
+        dst[k:do + hi + 1] = src[i:jend + 1]
+        return
+
+    # keep the current head of each run in a local
+    a = src[i]
+    b = src[j]
+    while True:
+        if a <= b:
+            dst[k] = a
+            k += 1
+            i += 1
+            if i > iend:
+                break
+            a = src[i]
+        else:
+            dst[k] = b
+            k += 1
+            j += 1
+            if j > jend:
+                break
+            b = src[j]
+
+    # only one of the runs has elements left
+    if i <= iend:
+        dst[k:do + hi + 1] = src[i:iend + 1]
+    else:
+        dst[k:do + hi + 1] = src[j:jend + 1]
+
+# Iterative bottom-up merge sort of arr[l..r]. A single buffer
+# of size n (of arr's type, see buffers.py) is allocated up front;
+# every pass merges runs of width w from one of arr/buffer into
+# the other.
+def mergeSortBottomUp(arr, l, r):
+    n = r - l + 1
+    if n < 2:
+        return
+
+    # already sorted: nothing to do
+    i = l
+    while i < r and arr[i] <= arr[i + 1]:
+        i += 1
+    if i == r:
+        return
+
+    buf = scratch(arr, n)
+
+    src, so = arr, l
+    dst, do = buf, 0
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            m = lo + width - 1
+            hi = min(lo + 2 * width - 1, n - 1)
+            if m >= hi:
+                # lone run at the end, nothing to merge it with
+                dst[do + lo:do + hi + 1] = src[so + lo:so + hi + 1]
+            else:
+                mergeInto(src, so, dst, do, lo, m, hi)
+
+        # swap roles for the next pass
+        src, so, dst, do = dst, do, src, so
+        width *= 2
+
+    # after an odd number of passes the result sits in buf
+    if src is buf:
+        arr[l:r + 1] = buf
+
+# Index of the first element in a[lo..hi-1] greater than key,
+# found by probing lo, lo+1, lo+3, lo+7, ... and then bisecting
+# the bracket, so the cost is O(log distance)
+def gallopRight(key, a, lo, hi):
+    last = lo
+    ofs = 1
+    while lo + ofs - 1 < hi and not key < a[lo + ofs - 1]:
+        last = lo + ofs
+        ofs <<= 1
+    return bisect_right(a, key, last, min(lo + ofs - 1, hi))
+
+# Index of the first element in a[lo..hi-1] not less than key
+def gallopLeft(key, a, lo, hi):
+    last = lo
+    ofs = 1
+    while lo + ofs - 1 < hi and a[lo + ofs - 1] < key:
+        last = lo + ofs
+        ofs <<= 1
+    return bisect_left(a, key, last, min(lo + ofs - 1, hi))
+
+# Length of the run starting at arr[lo] (not going past r).
+# A strictly descending run is reversed in place; requiring
+# strictness keeps the sort stable.
+def countRun(arr, lo, r):
+    hi = lo + 1
+    if hi > r:
+        return 1
+
+    if arr[hi] < arr[lo]:
+        while hi < r and arr[hi + 1] < arr[hi]:
+            hi += 1
+        arr[lo:hi + 1] = arr[lo:hi + 1][::-1]
+    else:
+        while hi < r and not arr[hi + 1] < arr[hi]:
+            hi += 1
+    return hi - lo + 1
+
+# Smallest run length worth merging, chosen so that n / minRun
+# is close to (but not above) a power of two
+def minRunLength(n):
+    extra = 0
+    while n >= MIN_MERGE:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+# Merge arr[l..m] and arr[m+1..r], copying only the left run out.
+# Runs are merged one element at a time until one side wins
+# minGallop times in a row; then whole blocks are moved with
+# gallopRight/gallopLeft until galloping stops paying off.
+# state[0] holds minGallop across merges.
+def mergeLo(arr, l, m, r, state):
+    L = sliceCopy(arr, l, m + 1)
+    i = 0
+    iend = len(L)
+    j = m + 1
+    k = l
+    minGallop = state[0]
+
+    while i < iend and j <= r:
+        winsL = winsR = 0
+        while i < iend and j <= r:
+            if arr[j] < L[i]:
+                arr[k] = arr[j]
+                j += 1
+                winsR += 1
+                winsL = 0
+            else:
+                arr[k] = L[i]
+                i += 1
+                winsL += 1
+                winsR = 0
+            k += 1
+            if winsL >= minGallop or winsR >= minGallop:
+                break
+
+        while i < iend and j <= r:
+            # left elements <= arr[j] go first (stability)
+            cnt1 = gallopRight(arr[j], L, i, iend) - i
+            if cnt1:
+                arr[k:k + cnt1] = L[i:i + cnt1]
+                i += cnt1
+                k += cnt1
+                if i == iend:
+                    break
+
+            # right elements < L[i]
+            cnt2 = gallopLeft(L[i], arr, j, r + 1) - j
+            if cnt2:
+                arr[k:k + cnt2] = arr[j:j + cnt2]
+                j += cnt2
+                k += cnt2
+                if j > r:
+                    break
+
+            if cnt1 < MIN_GALLOP and cnt2 < MIN_GALLOP:
+                minGallop += 1
+                break
+            minGallop = max(1, minGallop - 1)
+
+    # whatever is left of the right run is already in place
+    arr[k:k + iend - i] = L[i:]
+    state[0] = minGallop
+
+# Merge two adjacent sorted runs arr[l..m] and arr[m+1..r]
+def mergeRuns(arr, l, m, r, state):
+    # left elements <= arr[m+1] are already in their final place
+    l = gallopRight(arr[m + 1], arr, l, m + 1)
+    if l > m:
+        return
+
+    # and so are right elements >= arr[m]
+    r = gallopLeft(arr[m], arr, m + 1, r + 1) - 1
+
+    if min(m - l + 1, r - m) < MIN_GALLOP:
+        merge(arr, l, m, r)
+    else:
+        mergeLo(arr, l, m, r, state)
+
+# Merge runs[i] and runs[i+1] (each [start, length])
+def mergeAt(arr, runs, i, state):
+    base1, len1 = runs[i]
+    base2, len2 = runs[i + 1]
+    runs[i] = [base1, len1 + len2]
+    del runs[i + 1]
+    mergeRuns(arr, base1, base1 + len1 - 1, base2 + len2 - 1, state)
+
+# Merge runs on the stack until, for the top runs A, B, C (C on top),
+# A > B + C and B > C hold, which keeps the stack O(log n) deep and
+# the merges balanced
+def mergeCollapse(arr, runs, state):
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+            if runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+        elif runs[i][1] > runs[i + 1][1]:
+            break
+        mergeAt(arr, runs, i, state)
+
+# Natural (TimSort-style) merge sort of arr[l..r]: finds existing
+# ascending/descending runs, extends short ones to minRun with binary
+# insertion sort, and merges them with galloping. Sorted or reverse
+# sorted input costs O(n).
+def timSort(arr, l, r):
+    n = r - l + 1
+    if n < 2:
+        return
+
+    minRun = minRunLength(n)
+    runs = []
+    state = [MIN_GALLOP]
+
+    lo = l
+    while lo <= r:
+        runLen = countRun(arr, lo, r)
+
+        # extend short runs to minRun elements
+        if runLen < minRun:
+            force = min(minRun, r - lo + 1)
+            binaryInsertionSort(arr, lo, lo + force - 1, lo + runLen)
+            runLen = force
+
+        runs.append([lo, runLen])
+        mergeCollapse(arr, runs, state)
+        lo += runLen
+
+    # merge whatever is left on the stack
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+            i -= 1
+        mergeAt(arr, runs, i, state)
+
+# Top-down merge sort of arr[l..r] that insertion sorts ranges of at
+# most cutoff elements (MERGE_CUTOFF by default) instead of recursing
+# down to single elements, and skips the merge when the two sorted
+# halves are already in order
+def hybridMergeSort(arr, l, r, cutoff=None):
+    if cutoff is None:
+        cutoff = MERGE_CUTOFF
+    if r - l + 1 <= cutoff or l >= r:
+        insertionSort(arr, l, r, mode="binary")
+        return
+
+    m = l + (r - l) // 2
+    hybridMergeSort(arr, l, m, cutoff)
+    hybridMergeSort(arr, m + 1, r, cutoff)
+    if arr[m] <= arr[m + 1]:
+        return
+    merge(arr, l, m, r)
+
+# mode "topdown" is the recursive textbook merge sort,
+# mode "hybrid" runs hybridMergeSort() (insertion sort below the cutoff),
+# mode "bottomup" runs mergeSortBottomUp() on the same range and
+# mode "natural" runs the adaptive timSort(). All modes are stable.
+# key= / reverse= work as in sorted() (decorate-sort-undecorate, so
+# key is called once per element; see decorate.py)
+def mergeSort(arr, l, r, mode="topdown", key=None, reverse=False):
+    if key is not None or reverse:
+        sortDecorated(arr, l, r, lambda a, lo, hi: mergeSort(a, lo, hi, mode), key, reverse)
+        return
+    if mode == "hybrid":
+        hybridMergeSort(arr, l, r)
+        return
+    if mode == "bottomup":
+        mergeSortBottomUp(arr, l, r)
+        return
+    if mode == "natural":
+        timSort(arr, l, r)
+        return
+    if mode != "topdown":
+        raise ValueError(f"unknown merge sort mode: {mode!r}")
+
     if l < r:
         m = l + (r - l) // 2
         mergeSort(arr, l, m)
         mergeSort(arr, m + 1, r)
         merge(arr, l, m, r)
 
-arr = [12, 11, 13, 5, 6, 7]
-print("Given array is:", arr)
+if __name__ == "__main__":
+    arr = [12, 11, 13, 5, 6, 7]
+    print("Given array is:", arr)
 
-mergeSort(arr, 0, len(arr) - 1)
-print("Sorted array is:", arr)
+    mergeSort(arr, 0, len(arr) - 1)
+    print("Sorted array is:", arr)
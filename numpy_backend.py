@@ -0,0 +1,328 @@
+# Vectorized NumPy versions of the five sorts in this project.
+#
+# Every function takes the same arguments as its pure-Python twin
+# (insertion_sort.insertionSort, merge_sort.mergeSort, ...) and sorts
+# in place. A numpy.ndarray, or anything exposing the buffer protocol
+# (array.array, memoryview, bytearray, ...), is wrapped without
+# copying, so the caller's memory is sorted directly. Plain lists are
+# copied into an array and written back at the end.
+#
+# NumPy is optional: importing this module works without it, and the
+# sorts raise ImportError when called.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+# radix sort digit width, as in radix_sort.radixSortLSD
+RADIX_BITS = 8
+
+
+def requireNumpy():
+    if np is None:
+        raise ImportError("the numpy backend needs NumPy (pip install numpy)")
+
+
+# Return (a, copied): a zero-copy ndarray view of arr when possible,
+# otherwise a fresh array that has to be written back to arr
+def asArray(arr):
+    requireNumpy()
+    if isinstance(arr, np.ndarray):
+        return arr, False
+    try:
+        return np.asarray(memoryview(arr)), False
+    except TypeError:
+        return np.array(arr), True
+
+
+# Copy the sorted array back into arr if asArray() had to copy it
+def writeBack(arr, a, copied):
+    if copied:
+        arr[:] = a.tolist()
+
+
+# Order-preserving map from an integer array to uint64 keys
+# (subtract the minimum; wrap-around is exact modulo 2**64).
+# Returns (keys, bias) so that original = keys + bias.
+def biasedKeys(a):
+    if a.dtype.kind not in "iu":
+        raise TypeError(f"integer data needed here, got dtype {a.dtype}")
+    bias = a.min()
+    keys = a.astype(np.int64) - np.int64(bias)
+    return keys.view(np.uint64), int(bias)
+
+
+def fromKeys(keys, bias, dtype):
+    return (keys.view(np.int64) + np.int64(bias)).astype(dtype, copy=False)
+
+
+# ==============
+# Insertion sort
+# ==============
+
+# Insertion sort of arr[low..high]: the insert position comes from
+# np.searchsorted and the block is moved with one slice copy, so each
+# step is O(log n) comparisons plus a memmove
+def insertionSort(arr, low=0, high=None):
+    a, copied = asArray(arr)
+    if high is None:
+        high = len(a) - 1
+
+    for i in range(low + 1, high + 1):
+        key = a[i]
+        pos = low + int(np.searchsorted(a[low:i], key, side="right"))
+        if pos < i:
+            a[pos + 1:i + 1] = a[pos:i]
+            a[pos] = key
+
+    writeBack(arr, a, copied)
+
+
+# ==========
+# Merge sort
+# ==========
+
+# One bottom-up pass over keys (int64, values in 0..span) merging every
+# pair of adjacent runs of width w at once. Each pair's keys are offset
+# by pair * (span + 1), which keeps all left runs (and all right runs)
+# globally sorted, so one np.searchsorted per side gives every
+# element's rank in its partner run. Left wins ties, so it is stable.
+def mergePassOffset(keys, w, span):
+    n = len(keys)
+    idx = np.arange(n)
+    pair = idx // (2 * w)
+    isLeft = (idx - pair * 2 * w) < w
+
+    combined = pair * (span + 1) + keys
+    left = combined[isLeft]
+    right = combined[~isLeft]
+
+    # runs before pair p hold p * w elements on either side
+    pairL = pair[isLeft]
+    pairR = pair[~isLeft]
+    posL = idx[isLeft] + np.searchsorted(right, left, side="left") - pairL * w
+    posR = idx[~isLeft] - w + np.searchsorted(left, right, side="right") - pairR * w
+
+    out = np.empty_like(keys)
+    out[posL] = keys[isLeft]
+    out[posR] = keys[~isLeft]
+    return out
+
+
+# Same pass for any dtype, one np.searchsorted per pair of runs
+def mergePassPairs(a, w):
+    n = len(a)
+    out = np.empty_like(a)
+    for lo in range(0, n, 2 * w):
+        m = min(lo + w, n)
+        hi = min(lo + 2 * w, n)
+        left = a[lo:m]
+        right = a[m:hi]
+        if len(right) == 0 or left[-1] <= right[0]:
+            out[lo:hi] = a[lo:hi]
+            continue
+        posL = np.arange(len(left)) + np.searchsorted(right, left, side="left")
+        posR = np.arange(len(right)) + np.searchsorted(left, right, side="right")
+        out[lo + posL] = left
+        out[lo + posR] = right
+    return out
+
+
+# Bottom-up merge sort of arr[l..r] with vectorized merge passes
+def mergeSort(arr, l, r):
+    a, copied = asArray(arr)
+    seg = a[l:r + 1]
+    n = len(seg)
+    if n < 2:
+        writeBack(arr, a, copied)
+        return
+
+    if seg.dtype.kind in "iu":
+        keys, bias = biasedKeys(seg)
+        span = int(keys.max())
+
+        # the pair offsets must stay inside int64
+        if (n // 2 + 1) * (span + 1) < 2 ** 62:
+            keys = keys.astype(np.int64)
+            w = 1
+            while w < n:
+                keys = mergePassOffset(keys, w, span)
+                w *= 2
+            seg[:] = fromKeys(keys.view(np.uint64), bias, seg.dtype)
+            writeBack(arr, a, copied)
+            return
+
+    work = seg.copy()
+    w = 1
+    while w < n:
+        work = mergePassPairs(work, w)
+        w *= 2
+    seg[:] = work
+    writeBack(arr, a, copied)
+
+
+# =========
+# Quicksort
+# =========
+
+# Concatenated aranges: element indices of all segments [lo, lo+len)
+def segmentIndices(segLo, segLen):
+    total = int(segLen.sum())
+    starts = np.cumsum(segLen) - segLen
+    return np.repeat(segLo - starts, segLen) + np.arange(total)
+
+
+# Block-partition quicksort of arr[low..high]. All pending segments
+# are partitioned at once, level by level: each gets a median-of-three
+# pivot, every element is classified as <, == or > its pivot, and the
+# destinations come from per-segment class counts (np.bincount) plus
+# running ranks within each class (np.cumsum). Pivot-equal bands are
+# final, so duplicates cost nothing extra. Segments still pending after
+# 2*log2(n) + 8 levels are finished with the vectorized merge sort.
+def quickSort(arr, low, high):
+    a, copied = asArray(arr)
+    if high - low < 1:
+        writeBack(arr, a, copied)
+        return
+
+    segLo = np.array([low], dtype=np.int64)
+    segLen = np.array([high - low + 1], dtype=np.int64)
+    levels = 2 * int(math.log2(high - low + 1)) + 8
+
+    while len(segLo) and levels > 0:
+        levels -= 1
+        k = len(segLo)
+        segId = np.repeat(np.arange(k), segLen)
+        idx = segmentIndices(segLo, segLen)
+        vals = a[idx]
+
+        # median of first, middle and last element of every segment
+        x = a[segLo]
+        y = a[segLo + segLen // 2]
+        z = a[segLo + segLen - 1]
+        pivot = np.maximum(np.minimum(x, y), np.minimum(np.maximum(x, y), z))
+        p = pivot[segId]
+
+        cls = (vals > p).astype(np.int64) - (vals < p) + 1
+        counts = np.bincount(segId * 3 + cls, minlength=3 * k).reshape(k, 3)
+        classStart = np.cumsum(counts, axis=1) - counts
+
+        # rank of each element among same-class elements of its segment
+        first = np.cumsum(segLen) - segLen
+        rank = np.empty(len(idx), dtype=np.int64)
+        for c in range(3):
+            m = cls == c
+            before = np.cumsum(m) - m
+            r = before - before[first][segId]
+            rank[m] = r[m]
+
+        a[segLo[segId] + classStart[segId, cls] + rank] = vals
+
+        # recurse into the < and > parts
+        lessLo, lessLen = segLo, counts[:, 0]
+        moreLo, moreLen = segLo + counts[:, 0] + counts[:, 1], counts[:, 2]
+        segLo = np.concatenate([lessLo[lessLen > 1], moreLo[moreLen > 1]])
+        segLen = np.concatenate([lessLen[lessLen > 1], moreLen[moreLen > 1]])
+
+    # pathological pivots: finish what is left by merging
+    for lo, ln in zip(segLo.tolist(), segLen.tolist()):
+        mergeSort(a, lo, lo + ln - 1)
+
+    writeBack(arr, a, copied)
+
+
+# =========
+# Heap sort
+# =========
+
+# Heap sort of arr[low..high]. The max-heap is built level by level:
+# all nodes on one level head disjoint subtrees, so they are sifted
+# down together with vectorized compares and swaps. Extraction is
+# inherently one element at a time; it runs the pure-Python
+# Floyd extraction from Heap_sort on a list copy of the heap.
+def heapSort(arr, low=0, high=None):
+    from Heap_sort import floydSiftDown
+
+    a, copied = asArray(arr)
+    if high is None:
+        high = len(a) - 1
+    h = a[low:high + 1]
+    n = len(h)
+    if n < 2:
+        writeBack(arr, a, copied)
+        return
+
+    # build: bottom internal level first
+    lastInternal = (n - 2) // 2
+    level = int(math.log2(lastInternal + 1))
+    while level >= 0:
+        nodes = np.arange(2 ** level - 1, min(2 ** (level + 1) - 1, lastInternal + 1))
+        while len(nodes):
+            left = 2 * nodes + 1
+            nodes = nodes[left < n]
+            left = left[left < n]
+            right = np.minimum(left + 1, n - 1)
+            child = np.where(h[right] > h[left], right, left)
+            swap = h[child] > h[nodes]
+            nodes, child = nodes[swap], child[swap]
+            h[nodes], h[child] = h[child], h[nodes].copy()
+            nodes = child
+        level -= 1
+
+    # extract
+    heap = h.tolist()
+    for i in range(n - 1, 0, -1):
+        item = heap[i]
+        heap[i] = heap[0]
+        floydSiftDown(heap, i, item)
+    h[:] = heap
+
+    writeBack(arr, a, copied)
+
+
+# ==========
+# Radix sort
+# ==========
+
+# LSD radix sort with radix 2^bits on integer data. Digit histograms
+# come from np.bincount (a pass is skipped when one digit holds every
+# key); the stable scatter order comes from np.argsort(kind="stable"),
+# which NumPy runs as a counting/radix sort on 8- and 16-bit digits.
+# Returns the number of passes run, like radix_sort.radixSort.
+def radixSort(arr, radix=2 ** RADIX_BITS):
+    bits = radix.bit_length() - 1
+    if radix < 2 or radix != 1 << bits or bits > 16:
+        raise ValueError(f"radix must be a power of two up to 2**16, got {radix}")
+
+    a, copied = asArray(arr)
+    n = len(a)
+    if n < 2:
+        return 0
+
+    keys, bias = biasedKeys(a)
+    span = int(keys.max())
+    numPasses = (span.bit_length() + bits - 1) // bits
+    digitType = np.uint8 if bits <= 8 else np.uint16
+    mask = np.uint64(radix - 1)
+
+    done = 0
+    for p in range(numPasses):
+        digits = ((keys >> np.uint64(p * bits)) & mask).astype(digitType)
+        if np.bincount(digits, minlength=radix).max() == n:
+            continue
+        keys = keys[np.argsort(digits, kind="stable")]
+        done += 1
+
+    a[:] = fromKeys(keys, bias, a.dtype)
+    writeBack(arr, a, copied)
+    return done
+
+
+# Fresh ndarray copy of a sequence, for benchmarks that time the
+# sort on a copy of shared input
+def arrayCopy(seq):
+    requireNumpy()
+    return np.array(seq)
@@ -0,0 +1,154 @@
+# Parallel merge sort over a process pool.
+#
+# The input is copied once into a shared memory block of 64-bit ints,
+# so workers only receive the block's name and index ranges, never
+# pickled lists. Each worker sorts one chunk with mergeSort, then the
+# sorted chunks are merged pairwise, round by round, into a second
+# shared block (ping-pong). Every pairwise merge is cut into
+# independent pieces with merge-path co-ranking, so all workers stay
+# busy even in the last rounds when only one or two pairs are left.
+
+import os
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from buffers import like, typecode
+from merge_sort import merge, mergeSort
+
+# below this many elements per worker the pool is not worth starting
+MIN_CHUNK = 10_000
+
+
+# Sort src[lo:hi] of the shared block `name` in place
+def sortChunk(task):
+    name, lo, hi = task
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast("q")
+    try:
+        # straight on the shared block, with an array("q") buffer
+        mergeSort(view, lo, hi - 1, mode="bottomup")
+    finally:
+        view.release()
+        shm.close()
+
+
+# Merge src[aLo:aHi] and src[bLo:bHi] (both sorted) into
+# dst[out:out + total] with the existing merge()
+def mergePiece(task):
+    srcName, dstName, aLo, aHi, bLo, bHi, out = task
+    src = shared_memory.SharedMemory(name=srcName)
+    dst = shared_memory.SharedMemory(name=dstName)
+    sv = src.buf.cast("q")
+    dv = dst.buf.cast("q")
+    try:
+        tmp = array("q")
+        tmp.frombytes(sv[aLo:aHi].cast("B"))
+        nA = len(tmp)
+        tmp.frombytes(sv[bLo:bHi].cast("B"))
+        if 0 < nA < len(tmp):
+            merge(tmp, 0, nA - 1, len(tmp) - 1)
+        dv[out:out + len(tmp)] = tmp
+    finally:
+        sv.release()
+        dv.release()
+        src.close()
+        dst.close()
+
+
+# Merge-path co-rank: how many of the first d outputs of the stable
+# merge of a[aLo:aLo+aLen] and b[bLo:bLo+bLen] come from a
+def coRank(d, a, aLo, aLen, b, bLo, bLen):
+    lo = max(0, d - bLen)
+    hi = min(d, aLen)
+    while lo < hi:
+        i = (lo + hi) // 2
+        j = d - i
+        # b[j-1] must come before a[i]; ties go to a
+        if not b[bLo + j - 1] < a[aLo + i]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
+
+
+# Split the merge of runs [aLo, aHi) and [aHi, bHi) of view into
+# `pieces` tasks writing disjoint ranges of the output
+def mergeTasks(view, srcName, dstName, aLo, aHi, bHi, pieces):
+    aLen = aHi - aLo
+    bLen = bHi - aHi
+    total = aLen + bLen
+    tasks = []
+    prevI = prevJ = 0
+    for p in range(1, pieces + 1):
+        d = total * p // pieces
+        i = coRank(d, view, aLo, aLen, view, aHi, bLen)
+        j = d - i
+        if d > prevI + prevJ:
+            tasks.append((srcName, dstName, aLo + prevI, aLo + i,
+                          aHi + prevJ, aHi + j, aLo + prevI + prevJ))
+        prevI, prevJ = i, j
+    return tasks
+
+
+# Sort arr (a list of ints, an array of ints or a memoryview of one)
+# in place using `workers` processes (default: os.cpu_count()). Small
+# inputs, or workers=1, are sorted in-process with the bottom-up
+# mergeSort, which works on typed arrays directly.
+def parallelMergeSort(arr, workers=None):
+    n = len(arr)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, n // MIN_CHUNK))
+    if workers == 1:
+        mergeSort(arr, 0, n - 1, mode="bottomup")
+        return
+
+    blocks = [shared_memory.SharedMemory(create=True, size=n * 8) for _ in range(2)]
+    views = [b.buf.cast("q") for b in blocks]
+    try:
+        views[0][:] = arr if typecode(arr) == "q" else array("q", arr)
+
+        # chunk boundaries, one sorted run per worker
+        bounds = [n * w // workers for w in range(workers + 1)]
+
+        with Pool(workers) as pool:
+            pool.map(sortChunk, [(blocks[0].name, bounds[w], bounds[w + 1])
+                                 for w in range(workers)])
+
+            # pairwise merge rounds, each cut into about `workers` pieces
+            src = 0
+            while len(bounds) > 2:
+                dst = 1 - src
+                tasks = []
+                newBounds = [0]
+                for k in range(0, len(bounds) - 1, 2):
+                    aLo = bounds[k]
+                    aHi = bounds[k + 1]
+                    bHi = bounds[k + 2] if k + 2 < len(bounds) else aHi
+                    pieces = max(1, workers * (bHi - aLo) // n)
+                    tasks += mergeTasks(views[src], blocks[src].name, blocks[dst].name,
+                                        aLo, aHi, bHi, pieces)
+                    newBounds.append(bHi)
+                pool.map(mergePiece, tasks)
+                bounds = newBounds
+                src = dst
+
+        if typecode(arr) == "q":
+            memoryview(arr)[:] = views[src]
+        else:
+            arr[:] = like(arr, views[src].tolist())
+    finally:
+        for v in views:
+            v.release()
+        for b in blocks:
+            b.close()
+            b.unlink()
+
+
+if __name__ == "__main__":
+    import random
+
+    arr = [random.randint(0, 10**6) for _ in range(100_000)]
+    expected = sorted(arr)
+    parallelMergeSort(arr, workers=4)
+    print("Sorted correctly:", arr == expected)
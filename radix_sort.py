@@ -1,21 +1,31 @@
 # Python program for implementation of Radix Sort
+from buffers import scratch
+from decorate import sortByIntKey
+from insertion_sort import insertionSort
+
+# MSD radix sort hands buckets of at most this many
+# elements to insertion sort
+MSD_THRESHOLD = 32
+
 # A function to do counting sort of arr[] according to
-# the digit represented by exp.
+# the digit represented by exp. Keys are taken relative
+# to bias (the minimum, for negative input).
 
 
-def countingSort(arr, exp1):
+def countingSort(arr, exp1, bias=0):
 
     n = len(arr)
 
     # The output array elements that will have sorted arr
-    output = [0] * (n)
+    # (of arr's type, see buffers.py)
+    output = scratch(arr, n)
 
     # initialize count array as 0
     count = [0] * (10)
 
     # Store count of occurrences in count[]
     for i in range(0, n):
-        index = arr[i] // exp1
+        index = (arr[i] - bias) // exp1
         count[index % 10] += 1
 
     # Change count[i] so that count[i] now contains actual
@@ -26,7 +36,7 @@ def countingSort(arr, exp1):
     # Build the output array
     i = n - 1
     while i >= 0:
-        index = arr[i] // exp1
+        index = (arr[i] - bias) // exp1
         output[count[index % 10] - 1] = arr[i]
         count[index % 10] -= 1
         i -= 1
@@ -37,31 +47,224 @@ def countingSort(arr, exp1):
     for i in range(0, len(arr)):
         arr[i] = output[i]
 
+# LSD radix sort with a power-of-two radix (2^bits), using shifts
+# and masks instead of // and %. Works on any Python ints: keys are
+# biased by the minimum so negatives sort correctly. The bias is
+# applied on the fly, so the elements themselves move between arr
+# and a single buffer of arr's type (for an array("q") that is 8
+# bytes per element, see buffers.py). All digit histograms are built
+# in one pre-scan, and a pass is skipped when every key has the same
+# digit in it. Returns the number of scatter passes actually run.
+def radixSortLSD(arr, bits=8):
+    n = len(arr)
+    if n < 2:
+        return 0
+
+    radix = 1 << bits
+    mask = radix - 1
+
+    # keys are x - low, so the smallest one is 0
+    low = min(arr)
+    span = max(arr) - low
+    numPasses = (span.bit_length() + bits - 1) // bits
+
+    # histograms for every digit position in a single scan
+    counts = [[0] * radix for _ in range(numPasses)]
+    for x in arr:
+        k = x - low
+        for p in range(numPasses):
+            counts[p][k & mask] += 1
+            k >>= bits
+
+    buf = scratch(arr, n)
+    src, dst = arr, buf
+    done = 0
+    for p in range(numPasses):
+        count = counts[p]
+
+        # every key has the same digit here: the pass would be a no-op
+        if n in count:
+            continue
+
+        # turn counts into starting positions
+        total = 0
+        for d in range(radix):
+            c = count[d]
+            count[d] = total
+            total += c
+
+        # stable scatter into the other buffer
+        shift = p * bits
+        if low:
+            for x in src:
+                d = ((x - low) >> shift) & mask
+                dst[count[d]] = x
+                count[d] += 1
+        else:
+            for x in src:
+                d = (x >> shift) & mask
+                dst[count[d]] = x
+                count[d] += 1
+
+        src, dst = dst, src
+        done += 1
+
+    # after an odd number of passes the result sits in buf
+    if src is not arr:
+        arr[:] = src
+    return done
+
+# In-place MSD radix sort (American flag sort) of arr[low..high]
+# with radix 2^bits. Each bucket is permuted into place by following
+# swap cycles, then its sub-buckets are handled on an explicit stack;
+# only the per-bucket counts are allocated, so extra memory is
+# O(radix * depth) rather than O(n). Buckets of at most threshold
+# elements go to insertionSort, and a bucket whose elements are all
+# equal is not looked at again. Returns the deepest digit level used.
+def americanFlagSort(arr, low=0, high=None, bits=8, threshold=MSD_THRESHOLD):
+    if high is None:
+        high = len(arr) - 1
+    if high - low < 1:
+        return 0
+
+    radix = 1 << bits
+    mask = radix - 1
+
+    # bias keys by the minimum so negatives work, as in radixSortLSD()
+    # (scanned in place: slicing would copy the whole range)
+    bias = top = arr[low]
+    for i in range(low + 1, high + 1):
+        x = arr[i]
+        if x < bias:
+            bias = x
+        elif x > top:
+            top = x
+    span = top - bias
+    numPasses = (span.bit_length() + bits - 1) // bits
+    if numPasses == 0:
+        return 0
+
+    deepest = 0
+    stack = [(low, high, (numPasses - 1) * bits)]
+    while stack:
+        lo, hi, shift = stack.pop()
+
+        if hi - lo + 1 <= threshold:
+            insertionSort(arr, lo, hi, mode="binary")
+            continue
+
+        deepest = max(deepest, numPasses - shift // bits)
+
+        # count digits, noting whether the bucket is a single value
+        count = [0] * radix
+        first = arr[lo]
+        allSame = True
+        for i in range(lo, hi + 1):
+            x = arr[i]
+            if allSame and x != first:
+                allSame = False
+            count[((x - bias) >> shift) & mask] += 1
+        if allSame:
+            continue
+
+        # every key shares this digit: go straight to the next one
+        if hi - lo + 1 in count:
+            if shift > 0:
+                stack.append((lo, hi, shift - bits))
+            continue
+
+        # bucket d occupies arr[start[d]..end[d]-1]
+        start = [0] * radix
+        end = [0] * radix
+        pos = lo
+        for d in range(radix):
+            start[d] = pos
+            pos += count[d]
+            end[d] = pos
+
+        # American flag permutation: next[d] is the first slot of
+        # bucket d that does not hold a bucket-d element yet
+        nxt = start[:]
+        for d in range(radix):
+            while nxt[d] < end[d]:
+                x = arr[nxt[d]]
+                dx = ((x - bias) >> shift) & mask
+                while dx != d:
+                    # drop x into its own bucket, pick up what was there
+                    j = nxt[dx]
+                    arr[j], x = x, arr[j]
+                    nxt[dx] = j + 1
+                    dx = ((x - bias) >> shift) & mask
+                arr[nxt[d]] = x
+                nxt[d] += 1
+
+        # sub-buckets on the next digit
+        if shift > 0:
+            for d in range(radix):
+                if count[d] > 1:
+                    stack.append((start[d], end[d] - 1, shift - bits))
+
+    return deepest
+
 # Method to do Radix Sort
+# radix 10 is the classic decimal version below; a power of two
+# (e.g. 2**8, 2**11, 2**16) uses radixSortLSD(), or the in-place
+# americanFlagSort() with mode "msd". Returns the number of
+# counting/scatter passes run (digit levels for "msd").
+# "lsd" is stable, "msd" is not. With key= (a function returning an
+# int) or reverse=True the keys are extracted once and packed with
+# the element index into one int, which makes both modes stable
+# (see decorate.py); the return value is then None.
+
+
+def radixSort(arr, radix=10, mode="lsd", key=None, reverse=False):
+
+    if mode not in ("lsd", "msd"):
+        raise ValueError(f"unknown radix sort mode: {mode!r}")
+
+    if key is not None or reverse:
+        sortByIntKey(arr, lambda a: radixSort(a, radix, mode), key, reverse)
+        return None
+
+    if radix != 10 or mode == "msd":
+        bits = radix.bit_length() - 1
+        if radix < 2 or radix != 1 << bits:
+            raise ValueError(f"radix must be a power of two here, got {radix}")
+        if mode == "msd":
+            return americanFlagSort(arr, bits=bits)
+        return radixSortLSD(arr, bits)
 
+    if not arr:
+        return 0
 
-def radixSort(arr):
+    # the decimal digits below assume non-negative numbers:
+    # negative input is counted relative to its minimum
+    bias = min(min(arr), 0)
 
     # Find the maximum number to know number of digits
-    max1 = max(arr)
+    max1 = max(arr) - bias
 
     # Do counting sort for every digit. Note that instead
     # of passing digit number, exp is passed. exp is 10^i
     # where i is current digit number
     exp = 1
+    passes = 0
     while max1 / exp >= 1:
-        countingSort(arr, exp)
+        countingSort(arr, exp, bias)
         exp *= 10
+        passes += 1
+    return passes
 
 
 # Driver code
-arr = [170, 45, 75, 90, 802, 24, 2, 66]
+if __name__ == "__main__":
+    arr = [170, 45, 75, 90, 802, 24, 2, 66]
 
-# Function Call
-radixSort(arr)
+    # Function Call
+    radixSort(arr)
 
-for i in range(len(arr)):
-    print(arr[i], end=" ")
+    for i in range(len(arr)):
+        print(arr[i], end=" ")
 
 # This code is contributed by Mohit Kumra
-# Edited by Patrick Gallagher
\ No newline at end of file
+# Edited by Patrick Gallagher
@@ -0,0 +1,168 @@
+# Selection and partial sorting, for when only the k smallest
+# elements or the median are needed instead of a full sort.
+#
+#   nthElement(arr, k)    arr[k] ends up where a full sort would put
+#                         it, smaller-or-equal elements before it and
+#                         greater-or-equal ones after: O(n)
+#   partialSort(arr, k)   arr[0..k-1] holds the k smallest, sorted;
+#                         the rest is left in some order: O(n log k)
+#   topK(iterable, k)     the k largest (or smallest) of a stream,
+#                         keeping only k elements in memory
+#
+# nthElement is introselect: quickselect on the median-of-three /
+# ninther pivot and Lomuto partition of Quick_sort. If the ranges stop
+# shrinking (too many steps for their size, e.g. many equal keys or an
+# adversarial input), it switches to median-of-medians pivots and a
+# three-way partition, which keeps the worst case linear.
+# partialSort and topK keep a bounded max-heap with Heap_sort.heapify.
+
+from Heap_sort import heapify
+from insertion_sort import insertionSort
+from Quick_sort import INSERTION_CUTOFF, choosePivot, partition, partition3, swap
+
+# median-of-medians group size
+GROUP = 5
+
+
+# Index of a pivot in arr[low..high] that has at least ~30% of the
+# range on either side: the median of the medians of groups of five.
+# The group medians are gathered at the front of the range.
+def medianOfMedians(arr, low, high):
+    count = 0
+    for lo in range(low, high + 1, GROUP):
+        hi = min(lo + GROUP - 1, high)
+        insertionSort(arr, lo, hi)
+        swap(arr, low + count, lo + (hi - lo) // 2)
+        count += 1
+
+    mid = low + (count - 1) // 2
+    nthElement(arr, mid, low, low + count - 1)
+    return mid
+
+# Rearrange arr[low..high] (the whole array by default) so that arr[k]
+# is the element a full sort would put there, with arr[low..k-1] <=
+# arr[k] <= arr[k+1..high]
+def nthElement(arr, k, low=0, high=None):
+    if high is None:
+        high = len(arr) - 1
+    if not low <= k <= high:
+        raise IndexError("nthElement index out of range")
+
+    # quickselect steps allowed before falling back to median-of-medians
+    budget = 2 * (high - low + 1).bit_length()
+
+    while high - low + 1 > INSERTION_CUTOFF:
+        if budget > 0:
+            budget -= 1
+            swap(arr, choosePivot(arr, low, high), high)
+            lt = gt = partition(arr, low, high)
+        else:
+            lt, gt = partition3(arr, low, high, medianOfMedians(arr, low, high))
+
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            return
+
+    insertionSort(arr, low, high, mode="binary")
+
+# Move the k smallest elements of arr[low..high] (the whole array by
+# default) to arr[low..low+k-1] in sorted order; the others end up
+# in arr[low+k..high] in no particular order
+def partialSort(arr, k, low=0, high=None):
+    if high is None:
+        high = len(arr) - 1
+    k = min(k, high - low + 1)
+    if k <= 0:
+        return
+
+    # max-heap of the first k elements: its root is the largest
+    # of the k smallest seen so far
+    for i in range((k - 2) // 2, -1, -1):
+        heapify(arr, k, i, low)
+
+    for i in range(low + k, high + 1):
+        if arr[i] < arr[low]:
+            swap(arr, low, i)
+            heapify(arr, k, 0, low)
+
+    # heap sort the heap in place
+    for i in range(k - 1, 0, -1):
+        swap(arr, low, low + i)
+        heapify(arr, i, 0, low)
+
+# Reversed order for heap entries, so the max-heap code can keep the
+# k largest elements (its root is then the smallest of them)
+class Desc:
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+    def __gt__(self, other):
+        return other.item > self.item
+
+# The k largest elements of iterable, largest first (or the k
+# smallest, smallest first, with largest=False), in O(k) memory
+def topK(iterable, k, largest=True):
+    if k <= 0:
+        return []
+
+    it = iter(iterable)
+    heap = []
+    for x in it:
+        heap.append(Desc(x) if largest else x)
+        if len(heap) == k:
+            break
+    n = len(heap)
+    for i in range((n - 2) // 2, -1, -1):
+        heapify(heap, n, i)
+
+    # replace the root whenever a better element comes along
+    if n == k:
+        if largest:
+            for x in it:
+                if x > heap[0].item:
+                    heap[0] = Desc(x)
+                    heapify(heap, k, 0)
+        else:
+            for x in it:
+                if x < heap[0]:
+                    heap[0] = x
+                    heapify(heap, k, 0)
+
+    for i in range(n - 1, 0, -1):
+        swap(heap, 0, i)
+        heapify(heap, i, 0)
+    return [d.item for d in heap] if largest else heap
+
+
+if __name__ == "__main__":
+    import random
+
+    for n in (1, 2, 10, 100, 5000):
+        for hi in (3, n, 10**9):
+            arr = [random.randint(0, hi) for _ in range(n)]
+            ref = sorted(arr)
+            for k in {0, n // 3, n // 2, n - 1}:
+                a = list(arr)
+                nthElement(a, k)
+                assert a[k] == ref[k]
+                assert max(a[:k], default=a[k]) <= a[k] <= min(a[k + 1:], default=a[k])
+
+                a = list(arr)
+                partialSort(a, k)
+                assert a[:k] == ref[:k] and sorted(a) == ref
+
+                assert topK(iter(arr), k) == ref[::-1][:k]
+                assert topK(iter(arr), k, largest=False) == ref[:k]
+    print("nthElement / partialSort / topK agree with sorted():", True)
+
+    # organ-pipe input with a quickselect-hostile middle
+    n = 20_000
+    arr = list(range(n // 2)) + list(range(n // 2, 0, -1))
+    a = list(arr)
+    nthElement(a, n // 2)
+    print("Median of organ pipe:", a[n // 2] == sorted(arr)[n // 2])
@@ -0,0 +1,196 @@
+# One sort() front end that picks the algorithm from a cheap probe
+# of the input.
+#
+# probe() looks at about sqrt(n) evenly spaced elements for the
+# element types and the share of duplicates, and makes O(n) passes
+# that run at C speed and need O(1) extra space: the number of
+# descents (arr[i] > arr[i+1], so runs = descents + 1) and, for
+# integers, min / max / key width. With key= the keys are computed
+# once and probed instead of the elements, before anything is
+# decorated. choose() then picks, in this order:
+#
+#   n <= dispatch_small              binary insertion sort
+#   more scratch than `memory` bytes heapsort (O(1) extra space)
+#   descents <= dispatch_runs * n    natural merge sort (presorted data)
+#   ints spanning <= dispatch_radix_bits bits
+#                                    LSD radix sort, radix 256 (int
+#                                    keys: decorate.sortByIntKey)
+#   sample duplicates >= dispatch_dups
+#                                    3-way quicksort
+#   otherwise                        introsort
+#
+# The thresholds come from tuning.py (tune_cutoffs.py --only dispatch_*
+# measures them on this machine). Every decision is logged at DEBUG
+# level on the "sort_dispatch" logger, with the probe results.
+
+import logging
+import math
+import time
+from itertools import islice
+from operator import gt
+
+from buffers import typecode
+from decorate import sortByIntKey, sortDecorated
+from Heap_sort import heapSort
+from insertion_sort import insertionSort
+from merge_sort import mergeSort
+from Quick_sort import quickSort
+from radix_sort import radixSort
+import tuning
+
+logger = logging.getLogger("sort_dispatch")
+
+SMALL = tuning.get("dispatch_small")
+RADIX_BITS = tuning.get("dispatch_radix_bits")
+RUNS = tuning.get("dispatch_runs")
+DUPS = tuning.get("dispatch_dups")
+
+# scratch bytes per element of merge / radix sort on a list (slots);
+# typed buffers need their item size
+AUX_BYTES = 16
+
+
+# radixSort sorts whole sequences, so a sub-range of a list goes
+# through a copy; a typed buffer is sorted through a memoryview of it
+def radixRange(arr, low, high):
+    if low == 0 and high == len(arr) - 1:
+        radixSort(arr, 256)
+    elif typecode(arr) is not None:
+        radixSort(memoryview(arr)[low:high + 1], 256)
+    else:
+        part = arr[low:high + 1]
+        radixSort(part, 256)
+        arr[low:high + 1] = part
+
+# engine name (as in the benchmark registry) -> sorter(arr, low, high)
+ENGINES = {
+    "insertionsort/binary": lambda arr, low, high: insertionSort(arr, low, high, mode="binary"),
+    "heapsort/d2": lambda arr, low, high: heapSort(arr, low, high),
+    "mergesort/natural": lambda arr, low, high: mergeSort(arr, low, high, mode="natural"),
+    "radixsort/r256-lsd": radixRange,
+    "quicksort/3way": lambda arr, low, high: quickSort(arr, low, high, mode="3way"),
+    "quicksort/intro": lambda arr, low, high: quickSort(arr, low, high, mode="intro"),
+}
+
+# Statistics of arr[low..high] (see the top of the file)
+def probe(arr, low, high):
+    n = high - low + 1
+    step = max(1, n // max(1, math.isqrt(n)))
+    sample = arr[low:high + 1:step]
+
+    stats = {"n": n, "sample": len(sample)}
+    stats["aux"] = arr.itemsize if typecode(arr) else AUX_BYTES
+    types = {type(x) for x in sample}
+    stats["types"] = sorted(t.__name__ for t in types)
+    try:
+        stats["dups"] = 1 - len(set(sample)) / len(sample)
+    except TypeError:
+        stats["dups"] = 0.0  # unhashable elements
+
+    stats["descents"] = sum(map(gt, islice(arr, low, high), islice(arr, low + 1, high + 1)))
+
+    stats["bits"] = None
+    if types == {int}:
+        # a typed int buffer holds nothing else; in a list every
+        # element, not just the sample, has to be an int
+        if typecode(arr) or set(map(type, islice(arr, low, high + 1))) == {int}:
+            stats["min"] = min(islice(arr, low, high + 1))
+            stats["max"] = max(islice(arr, low, high + 1))
+            stats["bits"] = (stats["max"] - stats["min"]).bit_length()
+    return stats
+
+# (engine name, reason) for the probe statistics
+def choose(stats, memory=None):
+    n = stats["n"]
+    if memory is not None and n * stats["aux"] > memory:
+        return "heapsort/d2", f"{n * stats['aux']} bytes of scratch > memory={memory}"
+    if stats["descents"] <= RUNS * n:
+        return "mergesort/natural", f"{stats['descents']} descents <= {RUNS} * n"
+    if stats["bits"] is not None and stats["bits"] <= RADIX_BITS:
+        return "radixsort/r256-lsd", f"int keys span {stats['bits']} bits <= {RADIX_BITS}"
+    if stats["dups"] >= DUPS:
+        return "quicksort/3way", f"{stats['dups']:.0%} duplicates in sample >= {DUPS:.0%}"
+    return "quicksort/intro", "no special structure"
+
+# Sort arr[low..high] (the whole list, array.array or memoryview by
+# default) in place with the engine choose() picks, and return the
+# engine's name. memory caps the scratch space in bytes (None: no
+# limit). key= / reverse= work as in sorted() (see sortByKey).
+def sort(arr, low=0, high=None, key=None, reverse=False, memory=None):
+    if high is None:
+        high = len(arr) - 1
+    if key is not None or reverse:
+        return sortByKey(arr, low, high, key, reverse, memory)
+
+    n = high - low + 1
+    if n <= SMALL:
+        name = "insertionsort/binary"
+        ENGINES[name](arr, low, high)
+        logger.debug("sort n=%d -> %s (n <= %d)", n, name, SMALL)
+        return name
+
+    start = time.perf_counter()
+    stats = probe(arr, low, high)
+    probed = time.perf_counter()
+    name, reason = choose(stats, memory)
+    ENGINES[name](arr, low, high)
+    end = time.perf_counter()
+
+    logger.debug("sort n=%d -> %s (%s); probe %.6fs, sort %.6fs, stats=%s",
+                 n, name, reason, probed - start, end - probed, stats)
+    return name
+
+# key= / reverse= path of sort(). The keys are computed once and
+# probed, so choose() sees them and the memory budget before anything
+# is decorated. Int keys picked for radix sort go to sortByIntKey;
+# otherwise the chosen engine sorts (key, index) pairs. Both are stable.
+def sortByKey(arr, low, high, key, reverse, memory):
+    n = high - low + 1
+    keys = None if key is None else list(map(key, islice(arr, low, high + 1)))
+    if n <= SMALL:
+        name, reason, stats = "insertionsort/binary", f"n <= {SMALL}", None
+    else:
+        stats = probe(arr, low, high) if keys is None else probe(keys, 0, n - 1)
+        name, reason = choose(stats, memory)
+
+    if name == "radixsort/r256-lsd":
+        whole = low == 0 and high == len(arr) - 1
+        part = arr if whole else arr[low:high + 1]
+        sortByIntKey(part, lambda a: radixSort(a, 256), key, reverse, keys=keys)
+        if not whole:
+            arr[low:high + 1] = part
+    else:
+        sortDecorated(arr, low, high, ENGINES[name], key, reverse, keys=keys)
+
+    logger.debug("sort n=%d key=%s reverse=%s -> %s (%s); stats=%s",
+                 n, key, reverse, name, reason, stats)
+    return name
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    sys.setrecursionlimit(10000)
+
+    n = 50_000
+    inputs = {
+        "tiny": [random.randint(0, 99) for _ in range(20)],
+        "random": [random.randint(0, 10**12) for _ in range(n)],
+        "narrow ints": [random.randint(-1000, 1000) for _ in range(n)],
+        "presorted": sorted(random.random() for _ in range(n)),
+        "few strings": [random.choice("abcdef") * 3 for _ in range(n)],
+        "floats": [random.random() for _ in range(n)],
+    }
+    for label, arr in inputs.items():
+        a = list(arr)
+        name = sort(a)
+        print(f"{label:<12} {name:<20} sorted: {a == sorted(arr)}")
+
+    a = list(inputs["random"])
+    print("memory=64KB ->", sort(a, memory=64 * 1024), a == sorted(inputs["random"]))
+    recs = [(random.randint(0, 9), i) for i in range(1000)]
+    a = list(recs)
+    sort(a, key=lambda r: r[0], reverse=True)
+    print("key/reverse stable:", a == sorted(recs, key=lambda r: r[0], reverse=True))
@@ -0,0 +1,279 @@
+# Sorted collection for incremental / online sorting.
+#
+# Instead of appending a batch to a sorted array and sorting it all
+# again (O(n log n) per batch), the batch is sorted on its own and
+# merged into the existing data in one linear pass with mergeInto
+# from merge_sort: O(b log b + n) per batch of b elements.
+#
+# The elements live in a list of sorted chunks of at most
+# 2 * chunk elements, plus the largest element of every chunk, so a
+# single insert or delete only shifts one chunk: O(log n + chunk).
+# Small batches (b * chunk < n) are therefore inserted one by one,
+# which is cheaper than rewriting everything.
+#
+# rank(x) is the number of elements < x, select(i) the i-th smallest
+# (0-based, negative i counts from the end) and topK(k) the k largest.
+# Equal elements keep their insertion order, like in a stable sort.
+#
+# rank and select find their chunk with a Fenwick tree over the chunk
+# lengths, so both are O(log n). An insert or delete inside a chunk
+# updates the tree in O(log n); splitting or merging chunks drops it
+# and the next query rebuilds it in O(n / chunk).
+
+from bisect import bisect_left, bisect_right, insort_right
+
+from merge_sort import mergeInto, mergeSort
+
+# target chunk size; chunks are split once they reach twice this
+CHUNK = 512
+
+
+class SortedCollection:
+    def __init__(self, iterable=(), chunk=CHUNK):
+        self.chunk = chunk
+        self.chunks = []
+        self.maxes = []
+        self.tree = None
+        self.n = 0
+        self.update(iterable)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        for c in self.chunks:
+            yield from c
+
+    def __reversed__(self):
+        for c in reversed(self.chunks):
+            yield from reversed(c)
+
+    def __contains__(self, x):
+        k = bisect_left(self.maxes, x)
+        if k == len(self.chunks):
+            return False
+        c = self.chunks[k]
+        return c[bisect_left(c, x)] == x
+
+    def __getitem__(self, i):
+        return self.select(i)
+
+    def __repr__(self):
+        return f"SortedCollection({list(self)!r})"
+
+    # Rebuild the chunks from one sorted list
+    def load(self, items):
+        size = self.chunk
+        self.chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        self.maxes = [c[-1] for c in self.chunks]
+        self.tree = None
+        self.n = len(items)
+
+    # Insert one element
+    def add(self, x):
+        if not self.chunks:
+            self.chunks.append([x])
+            self.maxes.append(x)
+            self.tree = None
+            self.n = 1
+            return
+
+        # first chunk whose max is > x (equal elements go after)
+        k = bisect_right(self.maxes, x)
+        if k == len(self.chunks):
+            k -= 1
+            self.chunks[k].append(x)
+            self.maxes[k] = x
+        else:
+            insort_right(self.chunks[k], x)
+        self.n += 1
+        self._grow(k, 1)
+        self._split(k)
+
+    # Split chunk k in two halves once it reaches 2 * chunk elements
+    def _split(self, k):
+        c = self.chunks[k]
+        if len(c) >= 2 * self.chunk:
+            half = len(c) // 2
+            self.chunks[k:k + 1] = [c[:half], c[half:]]
+            self.maxes[k:k + 1] = [c[half - 1], c[-1]]
+            self.tree = None
+
+    # Insert a batch: sort it, then one linear merge with the data
+    def update(self, batch):
+        batch = list(batch)
+        b = len(batch)
+        if b == 0:
+            return
+        if b * self.chunk < self.n:
+            for x in batch:
+                self.add(x)
+            return
+
+        mergeSort(batch, 0, b - 1, mode="hybrid")
+        if self.n == 0:
+            self.load(batch)
+            return
+
+        src = list(self) + batch
+        out = [None] * len(src)
+        mergeInto(src, 0, out, 0, 0, self.n - 1, len(src) - 1)
+        self.load(out)
+
+    # Delete one element equal to x; ValueError if there is none
+    def remove(self, x):
+        if not self.discard(x):
+            raise ValueError(f"{x!r} not in collection")
+
+    # Delete one element equal to x; returns whether there was one
+    def discard(self, x):
+        k = bisect_left(self.maxes, x)
+        if k == len(self.chunks):
+            return False
+        c = self.chunks[k]
+        i = bisect_left(c, x)
+        if c[i] != x:
+            return False
+
+        del c[i]
+        self.n -= 1
+        if not c:
+            del self.chunks[k]
+            del self.maxes[k]
+            self.tree = None
+        else:
+            self.maxes[k] = c[-1]
+            self._grow(k, -1)
+            # fold a small chunk into its neighbour, and split the
+            # result again if that makes it too long
+            if len(c) < self.chunk // 2 and len(self.chunks) > 1:
+                j = k - 1 if k > 0 else k
+                merged = self.chunks[j] + self.chunks[j + 1]
+                self.chunks[j:j + 2] = [merged]
+                self.maxes[j:j + 2] = [merged[-1]]
+                self.tree = None
+                self._split(j)
+        return True
+
+    # Fenwick tree over the chunk lengths (1-based): tree[i] is the
+    # number of elements in chunks i - (i & -i) .. i - 1
+    def _index(self):
+        if self.tree is None:
+            m = len(self.chunks)
+            tree = [0] + [len(c) for c in self.chunks]
+            for i in range(1, m + 1):
+                j = i + (i & -i)
+                if j <= m:
+                    tree[j] += tree[i]
+            self.tree = tree
+        return self.tree
+
+    # Record that chunk k gained delta elements
+    def _grow(self, k, delta):
+        tree = self.tree
+        if tree is None:
+            return
+        i = k + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    # Number of elements < x
+    def rank(self, x):
+        k = bisect_left(self.maxes, x)
+        tree = self._index()
+        # elements in chunks 0 .. k-1
+        before = 0
+        i = k
+        while i:
+            before += tree[i]
+            i -= i & -i
+        if k == len(self.chunks):
+            return before
+        return before + bisect_left(self.chunks[k], x)
+
+    # The i-th smallest element (0-based)
+    def select(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("SortedCollection index out of range")
+        # descend the tree to the last chunk count k with fewer than
+        # i + 1 elements in chunks 0 .. k-1
+        tree = self._index()
+        k = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            if k + step < len(tree) and tree[k + step] <= i:
+                k += step
+                i -= tree[k]
+            step >>= 1
+        return self.chunks[k][i]
+
+    # The k largest elements, largest first (k smallest, smallest
+    # first, with largest=False)
+    def topK(self, k, largest=True):
+        out = []
+        chunks = reversed(self.chunks) if largest else self.chunks
+        for c in chunks:
+            if len(out) >= k:
+                break
+            need = k - len(out)
+            out.extend(reversed(c[-need:]) if largest else c[:need])
+        return out
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    # random operations checked against a plain sorted list
+    sc = SortedCollection(chunk=8)
+    ref = []
+    for step in range(3000):
+        op = random.random()
+        if op < 0.4:
+            x = random.randint(0, 200)
+            sc.add(x)
+            ref.append(x)
+        elif op < 0.5:
+            batch = [random.randint(0, 200) for _ in range(random.randint(0, 60))]
+            sc.update(batch)
+            ref += batch
+        elif op < 0.8 and ref:
+            x = random.choice(ref)
+            sc.remove(x)
+            ref.remove(x)
+        else:
+            assert not sc.discard(-1)
+        ref.sort()
+        if step % 50 == 0:
+            assert list(sc) == ref and len(sc) == len(ref)
+            assert all(len(c) < 2 * sc.chunk for c in sc.chunks)
+            x = random.randint(0, 200)
+            assert sc.rank(x) == bisect_left(ref, x)
+            assert (x in sc) == (x in ref)
+            if ref:
+                i = random.randrange(len(ref))
+                assert sc[i] == ref[i] and sc[-1] == ref[-1]
+            assert sc.topK(10) == ref[::-1][:10]
+            assert sc.topK(10, largest=False) == ref[:10]
+    print("Matches a sorted list:", list(sc) == ref)
+
+    # steady-state ingestion: merge the batch vs sort everything again
+    n, b = 200_000, 20_000
+    base = [random.randint(0, 10**9) for _ in range(n)]
+    batch = [random.randint(0, 10**9) for _ in range(b)]
+
+    sc = SortedCollection(base)
+    start = time.perf_counter()
+    sc.update(batch)
+    merged = time.perf_counter() - start
+
+    arr = sorted(base) + batch
+    start = time.perf_counter()
+    mergeSort(arr, 0, len(arr) - 1)
+    resorted = time.perf_counter() - start
+
+    print(f"n={n} b={b}: update {merged:.3f}s, mergeSort of all {resorted:.3f}s")
+    print("Same result:", list(sc) == arr)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Calibrate the insertion-sort cutoffs of the hybrid sorts and the
+thresholds of sort_dispatch.sort().
+
+Times quickSort(mode="hybrid") and mergeSort(mode="hybrid") on random
+input for every candidate cutoff and picks the one with the smallest
+median time. For each dispatch_* threshold, times the engine the
+dispatcher switches to against introsort on inputs of growing
+"difficulty" (size, key width, descents, fewer duplicates) and keeps
+the point up to which the engine still wins; dispatch_small starts
+above quick_cutoff and only stops on repeated significant losses,
+since small blocks are close calls. The results are saved
+for this machine and interpreter (see tuning.py); the sorts pick them
+up the next time they are imported.
+"""
+
+import argparse
+
+import statistics
+
+import benchmark
+import sort_dispatch
+import tuning
+from compare_results import mann_whitney
+from Quick_sort import hybridQuickSort
+from merge_sort import hybridMergeSort
+
+CANDIDATES = [0, 4, 8, 12, 16, 24, 32, 48, 64]
+
+# block sizes tried for dispatch_small; only those above quick_cutoff
+# count, since below it introsort is binary insertion sort as well
+SMALL_SIZES = (8, 16, 24, 32, 48, 64, 96, 128, 192, 256)
+# a block size is lost when insertion sort is slower than introsort by
+# more than SMALL_MARGIN with p < SMALL_ALPHA (the rule compare_results
+# uses), and the sweep stops after SMALL_PATIENCE losses in a row
+SMALL_MARGIN = 0.05
+SMALL_ALPHA = 0.05
+SMALL_PATIENCE = 2
+
+# setting name -> hybrid sort taking (arr, low, high, cutoff)
+SORTS = {
+    "quick_cutoff": hybridQuickSort,
+    "merge_cutoff": hybridMergeSort,
+}
+
+
+def calibrate(sort, arr, candidates=CANDIDATES, repeats=benchmark.REPEATS,
+              warmups=benchmark.WARMUPS, log=print):
+    """Median time of sort on arr for every cutoff; returns (best, timings)."""
+    timings = {}
+    for cutoff in candidates:
+        algo = benchmark.Algorithm(
+            f"{sort.__name__}/{cutoff}", "python",
+            lambda a, c=cutoff: sort(a, 0, len(a) - 1, c))
+        samples, _ = benchmark.measure(algo, arr, repeats, warmups)
+        timings[cutoff] = benchmark.summarize(samples)["T_sec"]
+        log(f"{sort.__name__}\tcutoff={cutoff}\t{timings[cutoff]:.6f}")
+    best = min(timings, key=timings.get)
+    return best, timings
+
+
+def crossover(engine, cases, repeats=benchmark.REPEATS, warmups=benchmark.WARMUPS,
+              log=print, block=None):
+    """Time the dispatch engine against introsort on (x, arr) cases,
+    easiest first. Returns (x of the last case before engine first
+    loses, or None if it loses at once; timings). With block, arr is
+    sorted as consecutive ranges of that size."""
+    timings = {}
+    last = None
+    winning = True
+    for x, arr in cases:
+        samples = time_engines(engine, arr, block or len(arr), repeats, warmups)
+        t = {name: statistics.median(v) for name, v in samples.items()}
+        timings[str(x)] = t
+        wins = t[engine] <= t["quicksort/intro"]
+        winning = winning and wins
+        if winning:
+            last = x
+        log(f"{engine}\t{x}\t{t[engine]:.6f}\tintro\t{t['quicksort/intro']:.6f}"
+            f"\t{'win' if wins else 'loss'}")
+    return last, timings
+
+
+def time_engines(engine, arr, size, repeats, warmups):
+    """Timing samples of the dispatch engine and of introsort sorting
+    arr as consecutive ranges of size elements."""
+    samples = {}
+    for name in (engine, "quicksort/intro"):
+        sort = sort_dispatch.ENGINES[name]
+        algo = benchmark.Algorithm(
+            name, "python",
+            lambda a, sort=sort: [sort(a, lo, lo + size - 1) for lo in range(0, len(a), size)])
+        samples[name], _ = benchmark.measure(algo, arr, repeats, warmups)
+    return samples
+
+
+# dispatch setting -> function(n, repeats, warmups) returning (value, timings)
+
+def tune_small(n, repeats, warmups, log=print):
+    # many short ranges, n elements in total; the threshold is the
+    # largest block size before a run of significant losses, and never
+    # below quick_cutoff (with one repeat no loss can be significant)
+    engine = "insertionsort/binary"
+    size = tuning.get("quick_cutoff")
+    losses = 0
+    timings = {}
+    for x in (s for s in SMALL_SIZES if s > size):
+        arr = benchmark.case_array("random", n - n % x)
+        samples = time_engines(engine, arr, x, repeats, warmups)
+        t = {name: statistics.median(v) for name, v in samples.items()}
+        timings[str(x)] = t
+        _, p = mann_whitney(samples[engine], samples["quicksort/intro"])
+        lost = p < SMALL_ALPHA and t[engine] > t["quicksort/intro"] * (1 + SMALL_MARGIN)
+        log(f"{engine}\t{x}\t{t[engine]:.6f}\tintro\t{t['quicksort/intro']:.6f}"
+            f"\t{'loss' if lost else 'win'}\tp={p:.3f}")
+        if not lost:
+            losses = 0
+            size = x
+            continue
+        losses += 1
+        if losses >= SMALL_PATIENCE:
+            break
+    return size, timings
+
+
+def tune_radix_bits(n, repeats, warmups):
+    cases = [(bits, benchmark.workload_case("wide", bits=bits)(n))
+             for bits in (8, 12, 16, 20, 24, 28, 32, 40, 48, 56)]
+    bits, timings = crossover("radixsort/r256-lsd", cases, repeats, warmups)
+    return bits or 0, timings
+
+
+def tune_runs(n, repeats, warmups):
+    cases = []
+    for ratio in (0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3):
+        # each swap adds about two descents; floats keep radix out of it
+        arr = [float(x) for x in benchmark.workload_case("nearly_sorted", swaps=int(ratio * n / 2))(n)]
+        stats = sort_dispatch.probe(arr, 0, n - 1)
+        cases.append((round(stats["descents"] / n, 4), arr))
+    ratio, timings = crossover("mergesort/natural", cases, repeats, warmups)
+    return ratio or 0.0, timings
+
+
+def tune_dups(n, repeats, warmups):
+    cases = []
+    for k in (2, 8, 32, 128, 512, 2048, 8192):
+        arr = [float(x) for x in benchmark.workload_case("few_unique", k=k)(n)]
+        stats = sort_dispatch.probe(arr, 0, n - 1)
+        cases.append((round(stats["dups"], 4), arr))
+    # most duplicates first: the threshold is the lowest share that still wins
+    ratio, timings = crossover("quicksort/3way", cases, repeats, warmups)
+    return 1.0 if ratio is None else ratio, timings
+
+
+DISPATCH = {
+    "dispatch_small": tune_small,
+    "dispatch_radix_bits": tune_radix_bits,
+    "dispatch_runs": tune_runs,
+    "dispatch_dups": tune_dups,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the insertion-sort cutoffs of the hybrid sorts.")
+    parser.add_argument("--n", type=int, default=20_000, help="size of the inputs")
+    parser.add_argument("--cutoffs", type=int, nargs="+", default=CANDIDATES,
+                        help="candidate cutoffs to time")
+    parser.add_argument("--only", choices=sorted(SORTS) + sorted(DISPATCH), action="append",
+                        help="tune only this setting (repeatable)")
+    parser.add_argument("--config", default=tuning.CONFIG_FILE, help="config file to update")
+    parser.add_argument("--dry-run", action="store_true", help="print the result without saving it")
+    parser.add_argument("--repeats", type=int, default=benchmark.REPEATS)
+    parser.add_argument("--warmups", type=int, default=benchmark.WARMUPS)
+    args = parser.parse_args()
+
+    arr = benchmark.case_array("random", args.n)
+    best, timings = {}, {}
+    for name in args.only or sorted(SORTS) + sorted(DISPATCH):
+        if name in DISPATCH:
+            best[name], timings[name] = DISPATCH[name](args.n, args.repeats, args.warmups)
+        else:
+            best[name], t = calibrate(SORTS[name], arr, args.cutoffs, args.repeats, args.warmups)
+            timings[name] = {str(c): v for c, v in t.items()}
+        print(f"-> {name} = {best[name]} (was {tuning.get(name)})\n")
+
+    if args.dry_run:
+        return
+    path = tuning.save(best, args.config, timings=timings, n=args.n)
+    print(f"Saved {best} for {tuning.machine_key()} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Per-machine tuning parameters of the sorts.
+
+Cutoffs such as the range size below which quickSort and mergeSort
+switch to insertion sort, and the thresholds sort_dispatch.sort() uses
+to pick an algorithm, depend on the interpreter and the machine.
+tune_cutoffs.py measures them and stores them in sort_tuning.json
+(or the file named by $SORT_TUNING), under a key made of the machine
+fingerprint and the Python version. The sort modules read SETTINGS at
+import time; values missing for this machine fall back to DEFAULTS.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.environ.get("SORT_TUNING", os.path.join(HERE, "sort_tuning.json"))
+
+DEFAULTS = {
+    # quickSort "hybrid" / "intro" / "3way": insertion sort at or below this size
+    "quick_cutoff": 16,
+    # mergeSort "hybrid": insertion sort at or below this size
+    "merge_cutoff": 16,
+    # sort_dispatch.sort(): binary insertion sort at or below this size
+    "dispatch_small": 32,
+    # ... LSD radix sort for ints whose range spans at most this many bits
+    "dispatch_radix_bits": 24,
+    # ... natural merge sort when descents <= this fraction of n
+    "dispatch_runs": 0.05,
+    # ... 3-way quicksort when this fraction of a sample are duplicates
+    "dispatch_dups": 0.5,
+}
+
+
+def machine_fingerprint():
+    """Short hash identifying the host; timings are only comparable
+    between runs with the same fingerprint and Python version."""
+    parts = [platform.node(), platform.system(), platform.machine(),
+             platform.processor(), str(os.cpu_count())]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def machine_key():
+    return f"{machine_fingerprint()}/{platform.python_implementation()}-" \
+           f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def read_config(path=CONFIG_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # a broken config must not stop the sorts from importing
+        return {}
+
+
+def load(path=CONFIG_FILE):
+    """DEFAULTS updated with the values calibrated on this machine."""
+    settings = dict(DEFAULTS)
+    entry = read_config(path).get(machine_key(), {})
+    settings.update({k: v for k, v in entry.items() if k in DEFAULTS})
+    return settings
+
+
+def save(values, path=CONFIG_FILE, **info):
+    """Store values (and extra info such as timings) for this machine,
+    keeping the entries of other machines in the file."""
+    config = read_config(path)
+    entry = config.setdefault(machine_key(), {})
+    entry.update(values)
+    entry.update(info)
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def get(name):
+    return SETTINGS.get(name, DEFAULTS.get(name))
+
+
+SETTINGS = load()
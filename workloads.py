@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Named, seeded synthetic workloads.
+
+generate(name, n, seed) builds one of the DISTRIBUTIONS below as int64
+data. The output is cut into blocks of BLOCK elements and every block
+gets its own random stream derived from (seed, block index), so the
+result depends only on the name, n, seed and parameters: not on how
+many worker processes filled it. With NumPy the blocks are generated
+vectorized; without it a pure-Python fallback is used (same
+distributions, different random streams, so the backend is part of the
+parameters). workers > 1 fills the blocks in a process pool, straight
+into shared memory.
+
+cached() does the same through an on-disk cache of binary array files
+(gen_quicksort_cases format) keyed by a hash of all the parameters.
+
+    python workloads.py --list
+    python workloads.py zipf --n 100000000 --seed 1 --param a=1.3 --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from gen_quicksort_cases import load_array_bin, save_array_bin
+import numpy_backend
+
+np = numpy_backend.np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("WORKLOAD_CACHE", os.path.join(HERE, "workload_cache"))
+
+# elements per independently seeded block
+BLOCK = 1 << 20
+# below this many elements a process pool is not worth starting
+MIN_PARALLEL = 4 * BLOCK
+
+
+# ===================
+# Block generators
+# ===================
+#
+# Each distribution has a NumPy and a pure-Python block function
+# f(rng, start, stop, n, **params) returning elements start..stop-1 of
+# an n-element workload; rng is a numpy Generator or a random.Random.
+# Structured ones only look at the positions. A distribution may also
+# have a "post" step that runs once over the whole array.
+
+def _np_positions(start, stop):
+    return np.arange(start, stop, dtype=np.int64)
+
+
+# Zipf(a) is drawn as a Pareto(a - 1) variate rounded down, which has
+# the same power-law tail and is much faster than numpy's rejection
+# sampler for a close to 1
+def _np_zipf(rng, start, stop, n, a=1.2, high=10**6):
+    z = rng.pareto(a - 1, stop - start) + 1
+    return np.minimum(z, high).astype(np.int64)
+
+
+def _py_zipf(rng, start, stop, n, a=1.2, high=10**6):
+    return [min(int(rng.paretovariate(a - 1)), high) for _ in range(stop - start)]
+
+
+def _np_killer(rng, start, stop, n):
+    return _killer_values(_np_positions(start, stop), n, np.where)
+
+
+def _py_killer(rng, start, stop, n):
+    return [_killer_values(i, n, lambda c, x, y: x if c else y) for i in range(start, stop)]
+
+
+def _killer_values(i, n, where):
+    """Musser's median-of-3 killer 1, k+1, 3, k+3, ..., k-1, 2k-1,
+    2, 4, ..., 2k for m = 2k, the largest multiple of 4 <= n, so
+    median-of-three keeps picking the second smallest element; the
+    last n - m positions hold m+1..n."""
+    k = n // 4 * 2
+    p = i + 1
+    return where(p > 2 * k, p,
+                 where(p > k, 2 * (p - k),
+                       where(p % 2 == 1, p, k + p - 1)))
+
+
+def _np_swaps(arr, rng, n, swaps=100):
+    pairs = min(swaps, n // 2)
+    idx = rng.choice(n, 2 * pairs, replace=False)
+    a, b = idx[:pairs], idx[pairs:]
+    arr[a], arr[b] = arr[b].copy(), arr[a].copy()
+
+
+def _py_swaps(arr, rng, n, swaps=100):
+    idx = rng.sample(range(n), 2 * min(swaps, n // 2))
+    for i, j in zip(idx[::2], idx[1::2]):
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+class Distribution:
+    __slots__ = ("name", "doc", "numpy", "python", "post", "defaults")
+
+    def __init__(self, name, doc, numpy, python, post=None, **defaults):
+        self.name = name
+        self.doc = doc
+        self.numpy = numpy
+        self.python = python
+        self.post = post
+        self.defaults = defaults
+
+
+DISTRIBUTIONS = {}
+
+
+def register_distribution(name, doc, numpy, python, post=None, **defaults):
+    DISTRIBUTIONS[name] = Distribution(name, doc, numpy, python, post, **defaults)
+
+
+register_distribution(
+    "uniform", "uniform ints in [low, high]",
+    lambda rng, s, e, n, low, high: rng.integers(low, high, e - s, dtype=np.int64, endpoint=True),
+    lambda rng, s, e, n, low, high: [rng.randint(low, high) for _ in range(e - s)],
+    low=0, high=10**6)
+register_distribution(
+    "zipf", "Zipf-like ranks (power law, exponent a) capped at high: a few values very common",
+    _np_zipf, _py_zipf, a=1.2, high=10**6)
+register_distribution(
+    "few_unique", "k distinct values spread evenly over [0, high]",
+    lambda rng, s, e, n, k, high: rng.integers(0, k, e - s, dtype=np.int64) * (high // max(k - 1, 1)),
+    lambda rng, s, e, n, k, high: [rng.randrange(k) * (high // max(k - 1, 1)) for _ in range(e - s)],
+    k=10, high=10**6)
+register_distribution(
+    "sorted", "0, 1, ..., n-1",
+    lambda rng, s, e, n: _np_positions(s, e),
+    lambda rng, s, e, n: list(range(s, e)))
+register_distribution(
+    "reverse", "n, n-1, ..., 1",
+    lambda rng, s, e, n: n - _np_positions(s, e),
+    lambda rng, s, e, n: list(range(n - s, n - e, -1)))
+register_distribution(
+    "sawtooth", "ascending runs 0..period-1, repeated",
+    lambda rng, s, e, n, period: _np_positions(s, e) % period,
+    lambda rng, s, e, n, period: [i % period for i in range(s, e)],
+    period=1000)
+register_distribution(
+    "organ_pipe", "ascending to n/2, then descending",
+    lambda rng, s, e, n: np.minimum(_np_positions(s, e), n - 1 - _np_positions(s, e)),
+    lambda rng, s, e, n: [min(i, n - 1 - i) for i in range(s, e)])
+register_distribution(
+    "nearly_sorted", "sorted with `swaps` random pairs exchanged",
+    lambda rng, s, e, n, swaps: _np_positions(s, e),
+    lambda rng, s, e, n, swaps: list(range(s, e)),
+    post=(_np_swaps, _py_swaps), swaps=100)
+register_distribution(
+    "quick_killer", "Musser's median-of-3 killer sequence (values 1..n)",
+    _np_killer, _py_killer)
+register_distribution(
+    "wide", "uniform ints with `bits` significant bits (many radix digits)",
+    lambda rng, s, e, n, bits: rng.integers(0, 1 << bits, e - s, dtype=np.int64),
+    lambda rng, s, e, n, bits: [rng.getrandbits(bits) for _ in range(e - s)],
+    bits=62)
+
+
+# ==========
+# Generation
+# ==========
+
+def resolve(name, backend=None, **params):
+    """(distribution, backend, full parameters) for a request."""
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"unknown workload: {name!r} (known: {', '.join(sorted(DISTRIBUTIONS))})")
+    dist = DISTRIBUTIONS[name]
+    unknown = set(params) - set(dist.defaults)
+    if unknown:
+        raise ValueError(f"unknown parameters for {name}: {', '.join(sorted(unknown))}")
+    if backend is None:
+        backend = "numpy" if np is not None else "python"
+    elif backend == "numpy":
+        numpy_backend.requireNumpy()
+    elif backend != "python":
+        raise ValueError(f"unknown backend: {backend!r}")
+    return dist, backend, {**dist.defaults, **params}
+
+
+def block_rng(backend, seed, index):
+    """Random stream of block `index` (index -1: the post step)."""
+    if backend == "numpy":
+        return np.random.default_rng([seed, index + 1])
+    return random.Random(f"{seed}/{index}")
+
+
+def _fill_blocks(task):
+    """Worker: generate blocks [first, last) into the shared block `shm_name`."""
+    shm_name, name, backend, n, seed, params, first, last = task
+    dist = DISTRIBUTIONS[name]
+    make = dist.numpy if backend == "numpy" else dist.python
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf.cast("q")
+    try:
+        for b in range(first, last):
+            s, e = b * BLOCK, min(n, (b + 1) * BLOCK)
+            block = make(block_rng(backend, seed, b), s, e, n, **params)
+            if backend == "numpy":
+                view[s:e] = memoryview(block.astype(np.int64, copy=False)).cast("B").cast("q")
+            else:
+                view[s:e] = array("q", block)
+    finally:
+        view.release()
+        shm.close()
+
+
+def generate(name, n, seed=0, workers=1, backend=None, **params):
+    """n elements of workload `name`: an int64 ndarray with NumPy,
+    an array("q") with backend="python"."""
+    dist, backend, params = resolve(name, backend, **params)
+    blocks = (n + BLOCK - 1) // BLOCK
+    workers = max(1, min(workers, blocks, n // MIN_PARALLEL or 1))
+
+    if workers == 1:
+        make = dist.numpy if backend == "numpy" else dist.python
+        parts = [make(block_rng(backend, seed, b), b * BLOCK, min(n, (b + 1) * BLOCK), n, **params)
+                 for b in range(blocks)]
+        if backend == "numpy":
+            arr = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        else:
+            arr = array("q")
+            for p in parts:
+                arr.extend(p)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=n * 8)
+        try:
+            bounds = [blocks * w // workers for w in range(workers + 1)]
+            with Pool(workers) as pool:
+                pool.map(_fill_blocks, [(shm.name, name, backend, n, seed, params,
+                                         bounds[w], bounds[w + 1]) for w in range(workers)])
+            if backend == "numpy":
+                arr = np.frombuffer(shm.buf, dtype=np.int64, count=n).copy()
+            else:
+                arr = array("q")
+                arr.frombytes(shm.buf[:n * 8])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    if dist.post:
+        post = dist.post[0] if backend == "numpy" else dist.post[1]
+        post(arr, block_rng(backend, seed, -1), n, **params)
+    return arr
+
+
+def cache_path(name, n, seed=0, backend=None, cache_dir=CACHE_DIR, **params):
+    _, backend, params = resolve(name, backend, **params)
+    meta = {"workload": name, "n": n, "seed": seed, "backend": backend, "params": params}
+    digest = hashlib.sha1(json.dumps(meta, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{name}_{n}_{seed}_{digest}.bin"), meta
+
+
+def cached(name, n, seed=0, workers=1, backend=None, cache_dir=CACHE_DIR, view=None, **params):
+    """generate() through the disk cache. The cached file is memory
+    mapped; view is as in load_array_bin (default: "numpy" with NumPy,
+    else "array"), so the numpy view is read-only."""
+    path, meta = cache_path(name, n, seed, backend, cache_dir, **params)
+    if view is None:
+        view = "numpy" if meta["backend"] == "numpy" else "array"
+    if os.path.exists(path):
+        try:
+            return load_array_bin(path, view)
+        except ValueError:
+            pass  # damaged cache file: generate it again
+
+    arr = generate(name, n, seed, workers, meta["backend"], **params)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    save_array_bin(tmp, _as_array(arr), params=meta)
+    os.replace(tmp, path)
+    return load_array_bin(path, view)
+
+
+def _as_array(arr):
+    """array("q") with the contents of an int64 ndarray or array."""
+    if isinstance(arr, array):
+        return arr
+    out = array("q")
+    out.frombytes(arr.tobytes())
+    return out
+
+
+def parse_param(text):
+    key, _, value = text.partition("=")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected key=number, got {text!r}") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a named synthetic workload.")
+    parser.add_argument("name", nargs="?", help="workload name (see --list)")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="distribution parameter as key=value (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=["numpy", "python"])
+    parser.add_argument("--out", help="also save the array to this binary file")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the cache")
+    parser.add_argument("--list", action="store_true", help="list the workloads and exit")
+    args = parser.parse_args()
+
+    if args.list or not args.name:
+        for name, dist in DISTRIBUTIONS.items():
+            params = ", ".join(f"{k}={v}" for k, v in dist.defaults.items())
+            print(f"{name:<14} {dist.doc}" + (f"  [{params}]" if params else ""))
+        return
+
+    params = dict(args.param)
+    start = time.perf_counter()
+    if args.no_cache:
+        arr = generate(args.name, args.n, args.seed, args.workers, args.backend, **params)
+    else:
+        arr = cached(args.name, args.n, args.seed, args.workers, args.backend, **params)
+    seconds = time.perf_counter() - start
+    print(f"{args.name}: n={args.n} seed={args.seed} in {seconds:.3f}s "
+          f"({args.n / max(seconds, 1e-9) / 1e6:.1f} M elements/s)")
+    if not args.no_cache:
+        print(f"cache: {cache_path(args.name, args.n, args.seed, args.backend, **params)[0]}")
+    if args.out:
+        save_array_bin(args.out, _as_array(arr),
+                       params={"workload": args.name, "n": args.n, "seed": args.seed, **params})
+        print(f"[Saved] {args.out}")
+
+
+if __name__ == "__main__":
+    main()